@@ -4,14 +4,35 @@ This module provides the application factory pattern for creating
 and configuring the Flask application.
 """
 
-import os
 from datetime import datetime
 from pathlib import Path
 
 from flask import Flask, request
 
+from app.app_env import AppEnv
+from app.json_provider import ORJSONProvider
+from app.services.analysis_cache import AnalysisCache
 from app.translations.loader import TranslationLoader
 
+# Directories already created by this process (create_app is called repeatedly in tests)
+_ensured_dirs: set[str] = set()
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create a directory once per process.
+
+    Args:
+        path: Directory to create (parents included).
+
+    Raises:
+        OSError: If the directory cannot be created.
+    """
+    key = str(path)
+    if key in _ensured_dirs:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(key)
+
 
 def create_app(config: dict | None = None) -> Flask:
     """Create and configure the Flask application.
@@ -23,57 +44,49 @@ def create_app(config: dict | None = None) -> Flask:
         Configured Flask application instance.
     """
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
 
-    # Validate production environment settings
-    # Note: Using ENV instead of FLASK_ENV (deprecated in Flask 2.3.0+)
-    secret_key = os.environ.get("SECRET_KEY")
-    if os.environ.get("ENV") == "production":
-        if not secret_key:
-            raise ValueError("SECRET_KEY must be set in production environment")
-        if os.environ.get("FLASK_DEBUG") == "1":
-            raise ValueError("DEBUG mode must be disabled in production environment")
-
-    # Parse and validate MAX_UPLOAD_SIZE
-    max_upload_size_raw = os.environ.get("MAX_UPLOAD_SIZE")
-    if max_upload_size_raw is None:
-        max_upload_size = 10 * 1024 * 1024  # Default: 10MB
-    else:
-        try:
-            max_upload_size = int(max_upload_size_raw)
-        except ValueError:
-            raise ValueError(
-                f"MAX_UPLOAD_SIZE must be a valid integer, got: '{max_upload_size_raw}'"
-            ) from None
-        if max_upload_size <= 0:
-            raise ValueError(f"MAX_UPLOAD_SIZE must be a positive integer, got: {max_upload_size}")
+    # Read and validate environment variables once per factory call
+    app_env = AppEnv.from_environ()
+
+    # Build the instance path once; it is reused for defaults, validation and mkdir
+    instance_path = Path(app.instance_path)
 
     # Default configuration
     app.config.update(
-        SECRET_KEY=secret_key or "dev-secret-key-change-in-production",
-        MAX_CONTENT_LENGTH=max_upload_size,
-        UPLOAD_FOLDER=Path(app.instance_path) / "uploads",
+        SECRET_KEY=app_env.secret_key or "dev-secret-key-change-in-production",
+        MAX_CONTENT_LENGTH=app_env.max_upload_size,
+        UPLOAD_FOLDER=instance_path / "uploads",
+        ANALYSIS_CACHE_SIZE=128,
     )
 
     # Override with custom config if provided
     if config:
         app.config.update(config)
 
-    # Validate UPLOAD_FOLDER path to prevent directory traversal
-    upload_folder = Path(app.config["UPLOAD_FOLDER"]).resolve()
-    instance_path = Path(app.instance_path).resolve()
-    if not upload_folder.is_relative_to(instance_path):
-        raise ValueError(f"UPLOAD_FOLDER must be within instance directory: {instance_path}")
+    # Validate UPLOAD_FOLDER path to prevent directory traversal.
+    # The default is built from instance_path, so only an override needs resolving.
+    if config and "UPLOAD_FOLDER" in config:
+        upload_folder = Path(app.config["UPLOAD_FOLDER"]).resolve()
+        resolved_instance_path = instance_path.resolve()
+        if not upload_folder.is_relative_to(resolved_instance_path):
+            raise ValueError(
+                f"UPLOAD_FOLDER must be within instance directory: {resolved_instance_path}"
+            )
 
     # Ensure instance and upload folders exist
     try:
-        Path(app.instance_path).mkdir(parents=True, exist_ok=True)
-        Path(app.config["UPLOAD_FOLDER"]).mkdir(parents=True, exist_ok=True)
+        _ensure_dir(instance_path)
+        _ensure_dir(Path(app.config["UPLOAD_FOLDER"]))
     except OSError as e:
         raise RuntimeError(
             f"Failed to create required directories at {app.instance_path} "
             f"or {app.config['UPLOAD_FOLDER']}: {e}"
         ) from e
 
+    # Per-app cache of analysis results for re-uploaded images (0 disables)
+    app.extensions["analysis_cache"] = AnalysisCache(maxsize=app.config["ANALYSIS_CACHE_SIZE"])
+
     # Register blueprints
     from app.routes import main_bp
     from app.routes.menu import menu_bp
@@ -81,17 +94,20 @@ def create_app(config: dict | None = None) -> Flask:
     app.register_blueprint(main_bp)
     app.register_blueprint(menu_bp)
 
+    # Register health check (can be disabled via ENABLE_HEALTH=False)
+    if app.config.get("ENABLE_HEALTH", True):
+        from app.routes.health import health_bp
+
+        app.register_blueprint(health_bp)
+
     # Register development blueprints (only in debug mode)
-    if os.environ.get("FLASK_DEBUG") == "1" or app.debug:
+    if app_env.flask_debug or app.debug:
         from app.routes.dev import dev_bp
 
         app.register_blueprint(dev_bp)
 
-    # Register context processor for template global functions
-    @app.context_processor
-    def inject_now():
-        """Inject now function into Jinja2 templates."""
-        return {"now": datetime.now}
+    # Expose now() as a Jinja2 global (constant, so no per-render context processor)
+    app.jinja_env.globals["now"] = datetime.now
 
     @app.context_processor
     def inject_translation_helper():
@@ -0,0 +1,92 @@
+"""Environment-derived settings for the application factory.
+
+``create_app`` reads the process environment exactly once through
+``AppEnv.from_environ``, which parses and validates every variable the
+factory depends on in one place.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+DEFAULT_MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+
+
+@dataclass(frozen=True, slots=True)
+class AppEnv:
+    """Validated snapshot of the environment variables used by create_app.
+
+    Attributes:
+        secret_key: SECRET_KEY, or None when unset/empty
+        env: ENV (e.g. "production"), or None when unset
+        flask_debug: True when FLASK_DEBUG is "1"
+        max_upload_size: MAX_UPLOAD_SIZE in bytes
+    """
+
+    secret_key: str | None
+    env: str | None
+    flask_debug: bool
+    max_upload_size: int
+
+    @property
+    def is_production(self) -> bool:
+        """Whether ENV is set to production."""
+        return self.env == "production"
+
+    @classmethod
+    def from_environ(cls, environ: Mapping[str, str] | None = None) -> AppEnv:
+        """Parse and validate factory settings from the environment.
+
+        Args:
+            environ: Mapping to read from (defaults to os.environ)
+
+        Returns:
+            Validated AppEnv
+
+        Raises:
+            ValueError: If production settings are unsafe or MAX_UPLOAD_SIZE
+                is not a positive integer
+        """
+        if environ is None:
+            environ = os.environ
+
+        app_env = cls(
+            secret_key=environ.get("SECRET_KEY") or None,
+            env=environ.get("ENV"),
+            flask_debug=environ.get("FLASK_DEBUG") == "1",
+            max_upload_size=_parse_max_upload_size(environ.get("MAX_UPLOAD_SIZE")),
+        )
+
+        # Note: Using ENV instead of FLASK_ENV (deprecated in Flask 2.3.0+)
+        if app_env.is_production:
+            if not app_env.secret_key:
+                raise ValueError("SECRET_KEY must be set in production environment")
+            if app_env.flask_debug:
+                raise ValueError("DEBUG mode must be disabled in production environment")
+
+        return app_env
+
+
+def _parse_max_upload_size(raw: str | None) -> int:
+    """Parse MAX_UPLOAD_SIZE, falling back to the default when unset.
+
+    Args:
+        raw: Raw environment value
+
+    Returns:
+        Maximum upload size in bytes
+
+    Raises:
+        ValueError: If the value is not a positive integer
+    """
+    if raw is None:
+        return DEFAULT_MAX_UPLOAD_SIZE
+    try:
+        max_upload_size = int(raw)
+    except ValueError:
+        raise ValueError(f"MAX_UPLOAD_SIZE must be a valid integer, got: '{raw}'") from None
+    if max_upload_size <= 0:
+        raise ValueError(f"MAX_UPLOAD_SIZE must be a positive integer, got: {max_upload_size}")
+    return max_upload_size
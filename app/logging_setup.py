@@ -0,0 +1,51 @@
+"""Non-blocking log output for the application loggers.
+
+Records from the ``app`` logger hierarchy are put on an in-process queue and
+formatted/written by a background QueueListener, so request threads never
+block on stderr or spend time rendering tracebacks.
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Started once per process by the entry point (run.py / gunicorn.conf.py)
+_listener: QueueListener | None = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message and traceback formatting to the listener.
+
+    The stock prepare() formats the record in the calling thread so that it
+    can be pickled; the queue here never leaves the process, so the record is
+    enqueued as-is.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Route the ``app`` loggers through a background queue listener.
+
+    Args:
+        level: Minimum level for the ``app`` logger hierarchy
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    app_logger = logging.getLogger("app")
+    app_logger.addHandler(_DeferredQueueHandler(log_queue))
+    app_logger.setLevel(level)
@@ -1,11 +1,13 @@
 """料理データモデル"""
 
+from __future__ import annotations
+
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class BoundingBox:
     """バウンディングボックス（正規化座標0-1スケール）
 
@@ -40,7 +42,7 @@ class BoundingBox:
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> "BoundingBox":
+    def from_dict(cls, data: dict) -> BoundingBox:
         """辞書から生成"""
         required = ["x", "y", "width", "height"]
         missing = [f for f in required if f not in data]
@@ -64,7 +66,24 @@ class Category(Enum):
     OTHER = "other"
 
 
-@dataclass
+# 値 → Category の逆引き（Enum.__call__ を経由しない O(1) 変換用）
+_CATEGORY_BY_VALUE: dict[str, Category] = {c.value: c for c in Category}
+
+# spiciness / sweetness の有効値（1-5）
+_VALID_LEVELS = frozenset(range(1, 6))
+
+# from_dict の必須フィールド（タプルはエラーメッセージの順序用、frozenset は包含判定用）
+_REQUIRED_DISH_FIELDS = (
+    "original_name",
+    "translated_name",
+    "description",
+    "spiciness",
+    "sweetness",
+)
+_REQUIRED_DISH_FIELD_SET = frozenset(_REQUIRED_DISH_FIELDS)
+
+
+@dataclass(slots=True)
 class Dish:
     """料理データモデル
 
@@ -96,24 +115,29 @@ class Dish:
 
     def __post_init__(self) -> None:
         """バリデーション処理"""
-        # 型チェック
-        if not isinstance(self.spiciness, int):
-            raise TypeError(f"spiciness must be an integer, got {type(self.spiciness).__name__}")
-        if not isinstance(self.sweetness, int):
-            raise TypeError(f"sweetness must be an integer, got {type(self.sweetness).__name__}")
-
-        # 範囲チェック
-        if not 1 <= self.spiciness <= 5:
-            raise ValueError(f"spiciness must be 1-5, got {self.spiciness}")
-        if not 1 <= self.sweetness <= 5:
-            raise ValueError(f"sweetness must be 1-5, got {self.sweetness}")
+        # 属性は一度だけロードしてローカルで検証する
+        spiciness = self.spiciness
+        sweetness = self.sweetness
+        number = self.number
+
+        # 型チェック（type() is int でboolなどのサブクラスも除外）
+        if type(spiciness) is not int:
+            raise TypeError(f"spiciness must be an integer, got {type(spiciness).__name__}")
+        if type(sweetness) is not int:
+            raise TypeError(f"sweetness must be an integer, got {type(sweetness).__name__}")
+
+        # 範囲チェック（int であることは確認済みなので集合の所属判定で足りる）
+        if spiciness not in _VALID_LEVELS:
+            raise ValueError(f"spiciness must be 1-5, got {spiciness}")
+        if sweetness not in _VALID_LEVELS:
+            raise ValueError(f"sweetness must be 1-5, got {sweetness}")
 
         # numberの検証（Noneは許容、指定時は1以上の整数）
-        if self.number is not None:
-            if not isinstance(self.number, int) or isinstance(self.number, bool):
-                raise TypeError(f"number must be an integer, got {type(self.number).__name__}")
-            if self.number < 1:
-                raise ValueError(f"number must be >= 1, got {self.number}")
+        if number is not None:
+            if type(number) is not int:
+                raise TypeError(f"number must be an integer, got {type(number).__name__}")
+            if number < 1:
+                raise ValueError(f"number must be >= 1, got {number}")
 
     def to_dict(self) -> dict[str, Any]:
         """辞書に変換
@@ -136,7 +160,7 @@ class Dish:
         }
 
     @classmethod
-    def from_dict(cls, data: dict) -> "Dish":
+    def from_dict(cls, data: dict) -> Dish:
         """辞書から生成
 
         Args:
@@ -148,26 +172,18 @@ class Dish:
         Raises:
             ValueError: 必須フィールドが欠けている場合
         """
-        # 必須フィールドのチェック
-        required_fields = [
-            "original_name",
-            "translated_name",
-            "description",
-            "spiciness",
-            "sweetness",
-        ]
-        missing_fields = [field for field in required_fields if field not in data]
-        if missing_fields:
+        # 必須フィールドのチェック（欠損リストはエラー時のみ構築）
+        if not data.keys() >= _REQUIRED_DISH_FIELD_SET:
+            missing_fields = [f for f in _REQUIRED_DISH_FIELDS if f not in data]
             raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
 
         # Enumの変換（無効な値はデフォルトにフォールバック）
-        try:
-            category = (
-                Category(data["category"])
-                if isinstance(data.get("category"), str)
-                else data.get("category", Category.OTHER)
-            )
-        except (ValueError, KeyError):
+        raw_category = data.get("category")
+        if isinstance(raw_category, Category):
+            category = raw_category
+        elif isinstance(raw_category, str):
+            category = _CATEGORY_BY_VALUE.get(raw_category, Category.OTHER)
+        else:
             category = Category.OTHER
 
         # BoundingBoxの変換（無効な値はNoneにフォールバック）
@@ -3,7 +3,7 @@
 This module defines and exports the main Blueprint for the application.
 """
 
-from flask import Blueprint, Response, jsonify, render_template
+from flask import Blueprint, render_template
 
 main_bp = Blueprint("main", __name__)
 
@@ -16,17 +16,3 @@ def index() -> str:
         Rendered HTML template for the main page.
     """
     return render_template("index.html")
-
-
-@main_bp.route("/health")
-def health() -> Response:
-    """Health check endpoint.
-
-    Returns:
-        JSON response indicating the application is healthy.
-    """
-    return jsonify(
-        {
-            "status": "healthy",
-        }
-    )
@@ -0,0 +1,21 @@
+"""Health check route.
+
+Kept in its own blueprint so create_app can skip it when ENABLE_HEALTH is False.
+"""
+
+from flask import Blueprint, Response
+
+health_bp = Blueprint("health", __name__)
+
+# The health payload never changes, so serialize it once at import time
+_HEALTH_BODY = b'{"status": "healthy"}'
+
+
+@health_bp.route("/health")
+def health() -> Response:
+    """Health check endpoint.
+
+    Returns:
+        JSON response indicating the application is healthy.
+    """
+    return Response(_HEALTH_BODY, mimetype="application/json")
@@ -10,16 +10,25 @@ API Error Codes:
 """
 
 import logging
+import operator
+import os
+import time
+from dataclasses import fields, replace
 from io import BytesIO
 from typing import Any
 
-from flask import Blueprint, Response, jsonify, render_template, request
+from flask import Blueprint, Response, current_app, jsonify, render_template, request
 from flask.typing import ResponseReturnValue
-from PIL import Image
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.parser import ParseFailedException
+from streaming_form_data.targets import ValueTarget
 from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import RequestEntityTooLarge
 
+from app.models.dish import Dish
 from app.services.ai.base import AIProviderError, InvalidMenuImageError
-from app.services.ai.factory import AIProviderFactory, UnknownProviderError
+from app.services.analysis_cache import AnalysisCache
+from app.services.image_header import sniff_image
 from app.translations.loader import TranslationLoader
 
 # Logger setup
@@ -27,10 +36,17 @@ logger = logging.getLogger(__name__)
 
 menu_bp = Blueprint("menu", __name__, url_prefix="/api")
 
-ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "webp"}
-ALLOWED_MIME_TYPES = {"image/png", "image/jpeg", "image/webp"}
+ALLOWED_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "webp"})
+ALLOWED_MIME_TYPES = frozenset({"image/png", "image/jpeg", "image/webp"})
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
+# Chunk size used when feeding the request body to the multipart parser
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Field order used for the columnar (?columnar=true) response layout
+_DISH_FIELDS = tuple(f.name for f in fields(Dish))
+_get_dish_fields = operator.attrgetter(*_DISH_FIELDS)
+
 
 def allowed_file(filename: str) -> bool:
     """
@@ -42,11 +58,42 @@ def allowed_file(filename: str) -> bool:
     Returns:
         True if extension is allowed
     """
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+    dot = filename.rfind(".")
+    return dot != -1 and filename[dot + 1 :].lower() in ALLOWED_EXTENSIONS
+
+
+def _dishes_to_columns(dishes: list[Dish]) -> dict[str, list[Any]]:
+    """
+    Convert dishes to a columnar layout (one list per field).
+
+    Args:
+        dishes: Dishes to convert
+
+    Returns:
+        Mapping of field name to the values of that field, in dish order
+    """
+    if not dishes:
+        return {name: [] for name in _DISH_FIELDS}
+    rows = map(_get_dish_fields, dishes)
+    return dict(zip(_DISH_FIELDS, map(list, zip(*rows, strict=True)), strict=True))
+
+
+def _is_htmx_request() -> bool:
+    """
+    Check whether the current request was issued by HTMX.
+
+    Returns:
+        True if the HX-Request header is set
+    """
+    return request.headers.get("HX-Request") == "true"
 
 
 def _create_error_response(
-    error_message: str, error_code: str, status_code: int, title: str = "Error"
+    error_message: str,
+    error_code: str,
+    status_code: int,
+    title: str = "Error",
+    is_htmx: bool | None = None,
 ) -> ResponseReturnValue:
     """
     Create error response (JSON or HTML depending on request type).
@@ -56,12 +103,16 @@ def _create_error_response(
         error_code: Error code
         status_code: HTTP status code
         title: Title for HTML response
+        is_htmx: Whether the request came from HTMX (looked up from headers if None)
 
     Returns:
         Tuple of (Response, status_code)
     """
+    if is_htmx is None:
+        is_htmx = _is_htmx_request()
+
     # Return HTML partial for HTMX requests
-    if request.headers.get("HX-Request") == "true":
+    if is_htmx:
         response = Response(
             render_template(
                 "partials/error.html",
@@ -108,28 +159,94 @@ def validate_image_file(file: FileStorage) -> tuple[bool, str | None, bytes | No
     if file.content_type not in ALLOWED_MIME_TYPES:
         return False, f"Invalid MIME type: {file.content_type}", None
 
-    # Read file once
-    file.seek(0)
-    image_data = file.read()
-    file_size = len(image_data)
-
-    # Check file size
+    # Check file size from the stream position so oversized uploads are never read into memory
+    file.seek(0, os.SEEK_END)
+    file_size = file.tell()
     if file_size > MAX_FILE_SIZE:
         return False, f"File size exceeds limit ({MAX_FILE_SIZE / (1024 * 1024):.0f}MB)", None
 
     if file_size == 0:
         return False, "File is empty", None
 
-    # Verify image can be opened
-    try:
-        Image.open(BytesIO(image_data))
-    except (OSError, Image.UnidentifiedImageError) as e:
-        logger.exception(f"Failed to open image: {e}")
+    # Read file once
+    file.seek(0)
+    image_data = file.read()
+
+    # Verify the content is a supported image by parsing its header (no decoder)
+    header = sniff_image(image_data)
+    if header is None:
+        logger.warning("Image header not recognized")
         return False, "Invalid image file", None
 
     return True, None, image_data
 
 
+@menu_bp.errorhandler(RequestEntityTooLarge)
+def _handle_request_too_large(error: RequestEntityTooLarge) -> ResponseReturnValue:
+    """
+    Reject bodies over MAX_CONTENT_LENGTH in the API's error format.
+
+    Werkzeug raises this from the Content-Length header before the body is
+    read, so oversized uploads never reach the parser or validate_image_file.
+
+    Args:
+        error: The raised exception
+
+    Returns:
+        413 error response (JSON or HTML depending on request type)
+    """
+    logger.warning("Request body exceeds MAX_CONTENT_LENGTH")
+    return _create_error_response(
+        error_message="File size exceeds the upload limit",
+        error_code="INVALID_FILE",
+        status_code=413,
+        title="File Too Large",
+    )
+
+
+def _read_image_upload() -> tuple[FileStorage | None, ResponseReturnValue | None]:
+    """
+    Read the ``image`` field of the upload, parsing multipart bodies natively.
+
+    Werkzeug's pure-Python multipart parser is CPU-bound on large uploads, so
+    multipart bodies are streamed through streaming-form-data instead. The
+    request body is consumed here, so call this only after the cheap header
+    checks (API key) have passed.
+
+    Returns:
+        Tuple of (uploaded file or None, error response if the multipart
+        body is malformed)
+    """
+    if request.mimetype != "multipart/form-data":
+        return request.files.get("image"), None
+
+    target = ValueTarget()
+    try:
+        parser = StreamingFormDataParser(headers={"Content-Type": request.content_type or ""})
+        parser.register("image", target)
+        read = request.stream.read
+        while chunk := read(_UPLOAD_CHUNK_SIZE):
+            parser.data_received(chunk)
+    except ParseFailedException as e:
+        logger.warning("Malformed multipart body: %s", e)
+        return None, (
+            jsonify(
+                {"success": False, "error": "Malformed multipart body", "code": "INVALID_FILE"}
+            ),
+            400,
+        )
+
+    if target.multipart_filename is None:
+        return None, None
+    file = FileStorage(
+        stream=BytesIO(target.value),
+        filename=target.multipart_filename,
+        name="image",
+        content_type=target.multipart_content_type,
+    )
+    return file, None
+
+
 @menu_bp.route("/analyze", methods=["POST"])
 def analyze_menu() -> ResponseReturnValue:
     """
@@ -139,6 +256,8 @@ def analyze_menu() -> ResponseReturnValue:
         Headers:
             X-API-Key: API key (required)
             X-Language: Language code ('en' or 'ja', optional, default: 'en')
+        Query:
+            columnar: 'true' to return dishes as one list per field (optional)
         Content-Type: multipart/form-data
         Body: image (file)
 
@@ -153,6 +272,11 @@ def analyze_menu() -> ResponseReturnValue:
     Returns:
         Analysis results in JSON format
     """
+    # Deferred: the factory pulls in the anthropic/openai SDKs (~1s import time)
+    from app.services.ai.factory import AIProviderFactory, UnknownProviderError
+
+    is_htmx = _is_htmx_request()
+
     # Get language from header
     language = request.headers.get("X-Language", "en")
     if language not in ["en", "ja"]:
@@ -173,17 +297,19 @@ def analyze_menu() -> ResponseReturnValue:
             error_code="NO_API_KEY",
             status_code=401,
             title=title_msg,
+            is_htmx=is_htmx,
         )
 
-    # Check file existence
-    if "image" not in request.files:
+    # Read the upload only once the request is known to carry an API key
+    file, parse_error = _read_image_upload()
+    if parse_error is not None:
+        return parse_error
+    if file is None:
         logger.warning("No image file in request")
         return jsonify(
             {"success": False, "error": "No image file provided", "code": "NO_FILE"}
         ), 400
 
-    file = request.files["image"]
-
     # Check if file is selected
     if file.filename == "":
         logger.warning("Empty filename")
@@ -192,7 +318,7 @@ def analyze_menu() -> ResponseReturnValue:
     # Validation
     is_valid, error_message, image_data = validate_image_file(file)
     if not is_valid:
-        logger.warning(f"Validation failed: {error_message}")
+        logger.warning("Validation failed: %s", error_message)
         return jsonify({"success": False, "error": error_message, "code": "INVALID_FILE"}), 400
 
     # After successful validation, image_data is bytes and content_type is set.
@@ -207,32 +333,50 @@ def analyze_menu() -> ResponseReturnValue:
         provider_name = request.headers.get("X-AI-Provider", "claude")
 
         logger.info(
-            f"Processing image: {file.filename}, size: {len(image_data)} bytes, "
-            f"MIME: {mime_type}, Language: {language}, Provider: {provider_name}"
+            "Processing image: %s, size: %d bytes, MIME: %s, Language: %s, Provider: %s",
+            file.filename,
+            len(image_data),
+            mime_type,
+            language,
+            provider_name,
         )
 
-        # Get AI provider with language support
-        provider = AIProviderFactory.create(
-            api_key=api_key, provider_name=provider_name, language=language
-        )
+        # Reuse the result of an identical earlier upload if we still have it
+        started = time.perf_counter()
+        analysis_cache: AnalysisCache = current_app.extensions["analysis_cache"]
+        cache_key = analysis_cache.make_key(image_data, api_key, provider_name, language)
+        result = analysis_cache.get(cache_key)
+
+        if result is not None:
+            logger.info("Analysis cache hit")
+            result = replace(result, processing_time=time.perf_counter() - started)
+        else:
+            # Get AI provider with language support
+            provider = AIProviderFactory.create(
+                api_key=api_key, provider_name=provider_name, language=language
+            )
 
-        # Analyze menu
-        result = provider.analyze_menu(image_data, mime_type)
+            # Analyze menu
+            result = provider.analyze_menu(image_data, mime_type)
+            analysis_cache.put(cache_key, result)
 
-        # Create response
+        # Create response (Dish dataclasses are serialized directly by the orjson provider)
+        columnar = request.args.get("columnar") == "true"
         response_data: dict[str, Any] = {
             "success": True,
-            "dishes": [dish.to_dict() for dish in result.dishes],
+            "dishes": _dishes_to_columns(result.dishes) if columnar else result.dishes,
             "provider": result.provider,
             "processing_time": result.processing_time,
         }
 
         logger.info(
-            f"Analysis complete: {len(result.dishes)} dishes found in {result.processing_time:.2f}s"
+            "Analysis complete: %d dishes found in %.2fs",
+            len(result.dishes),
+            result.processing_time,
         )
 
         # Return HTML partial for HTMX requests
-        if request.headers.get("HX-Request") == "true":
+        if is_htmx:
             return render_template(
                 "partials/dish_list.html",
                 dishes=result.dishes,
@@ -243,7 +387,7 @@ def analyze_menu() -> ResponseReturnValue:
         return jsonify(response_data), 200
 
     except UnknownProviderError as e:
-        logger.warning(f"Unknown provider requested: {e}")
+        logger.warning("Unknown provider requested: %s", e)
         default_msg = "This provider is not yet implemented."
         error_msg = TranslationLoader.get(
             language, "api_key_modal.provider_not_implemented", default_msg
@@ -256,9 +400,10 @@ def analyze_menu() -> ResponseReturnValue:
             error_code="PROVIDER_NOT_IMPLEMENTED",
             status_code=400,
             title=title_msg,
+            is_htmx=is_htmx,
         )
     except InvalidMenuImageError as e:
-        logger.warning(f"Invalid menu image: {e}")
+        logger.warning("Invalid menu image: %s", e)
         error_msg = (
             str(e)
             if str(e)
@@ -270,9 +415,10 @@ def analyze_menu() -> ResponseReturnValue:
             error_code="INVALID_MENU_IMAGE",
             status_code=400,
             title=title_msg,
+            is_htmx=is_htmx,
         )
     except AIProviderError as e:
-        logger.exception(f"AI provider error: {e}")
+        logger.exception("AI provider error: %s", e)
         error_msg = TranslationLoader.get(
             language, "toast.analysis_failed", f"AI analysis failed: {str(e)}"
         )
@@ -282,9 +428,10 @@ def analyze_menu() -> ResponseReturnValue:
             error_code="AI_ERROR",
             status_code=500,
             title=title_msg,
+            is_htmx=is_htmx,
         )
     except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=True)
+        logger.exception("Unexpected error: %s", e)
         error_msg = TranslationLoader.get(
             language, "toast.server_error", "An unexpected error occurred. Please try again later."
         )
@@ -294,4 +441,5 @@ def analyze_menu() -> ResponseReturnValue:
             error_code="INTERNAL_ERROR",
             status_code=500,
             title=title_msg,
+            is_htmx=is_htmx,
         )
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-import base64
+import functools
 import logging
 import time
 from typing import Literal, cast
 
 import anthropic
+import pybase64
 
 from app.models.dish import Dish
 from app.services.ai.base import (
@@ -18,15 +19,50 @@ from app.services.ai.base import (
 )
 from app.services.ai.prompt_builder import PromptBuilder
 from app.services.ai.response_parser import parse_dishes
+from app.services.image_resize import downscale_image
 
 logger = logging.getLogger(__name__)
 
+_NUMBER_FIELD_INSTRUCTION = """
+- number: Dish order number in the menu image (integer, starting from 1)
+  Assign numbers in reading order: top-to-bottom, then left-to-right for multi-column menus.
+  Every dish MUST have a unique sequential number."""
+
+_BOUNDING_BOX_INSTRUCTION = """
+- bounding_box: The location of the dish entry in the menu image (REQUIRED for each dish)
+  IMPORTANT: Think of the image as a 1.0 x 1.0 coordinate system where:
+  - (0, 0) is the TOP-LEFT corner of the image
+  - (1, 1) is the BOTTOM-RIGHT corner of the image
+
+  - x: X coordinate of the LEFT edge of the dish entry (0.0 to 1.0)
+  - y: Y coordinate of the TOP edge of the dish entry (0.0 to 1.0)
+  - width: Width of the bounding box (0.0 to 1.0)
+  - height: Height of the bounding box (0.0 to 1.0)
+
+  CRITICAL guidelines for bounding_box:
+  1. The bounding box should tightly enclose ONLY the dish name and its price/description text
+  2. Analyze the vertical position of each dish in the menu from TOP to BOTTOM
+     - First dish on the page should have a smaller y value (closer to 0)
+     - Last dish on the page should have a larger y value (closer to 1)
+  3. For a typical single-column menu:
+     - x is usually around 0.05-0.15 (dishes start near the left edge with some margin)
+     - width is usually around 0.7-0.9 (dishes span most of the width)
+  4. For a multi-column menu:
+     - Left column: x around 0.02-0.1
+     - Right column: x around 0.5-0.55
+  5. Height should match the actual text height of that dish entry (usually 0.03-0.1)
+  6. ALWAYS provide bounding_box coordinates - do not set to null unless truly impossible"""
+
+# Appended to the multilingual base prompt; independent of the request
+_EXTRA_INSTRUCTIONS = _NUMBER_FIELD_INSTRUCTION + _BOUNDING_BOX_INSTRUCTION
+
 
 class ClaudeProvider(AIProvider):
     """Claude APIを使用した画像解析プロバイダー"""
 
     MODEL = "claude-sonnet-4-6"
     MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB (matches CLAUDE.md spec)
+    MAX_IMAGE_EDGE = 1568  # Long edge above which Claude downsamples images before analysis
 
     def __init__(self, api_key: str, language: str = "en") -> None:
         """
@@ -67,6 +103,9 @@ class ClaudeProvider(AIProvider):
             APIKeyMissingError: API key is not configured
             APICallError: API call failed or image size exceeds limit
         """
+        # Claude would downsample a larger image anyway, so shrink it before upload
+        image_data, mime_type = downscale_image(image_data, mime_type, self.MAX_IMAGE_EDGE)
+
         # Validate image size
         if len(image_data) > self.MAX_IMAGE_SIZE:
             raise APICallError(
@@ -77,11 +116,14 @@ class ClaudeProvider(AIProvider):
         start_time = time.time()
 
         try:
-            # Encode image to base64
-            image_base64 = base64.standard_b64encode(image_data).decode("utf-8")
+            # Encode image to base64 (SIMD-accelerated, straight to str).
+            # Inline data is kept over the Files API: uploading first adds a round trip
+            # per uncached image and leaves user menus stored on the provider side, while
+            # repeat uploads are already served by the route's analysis cache.
+            image_base64 = pybase64.b64encode_as_string(image_data)
 
-            # Build prompt
-            prompt = self._build_prompt()
+            # Prompt depends only on the language, so it is built once per provider
+            prompt = self._prompt
 
             # Call Claude API — mime_type validated against ALLOWED_MIME_TYPES at the route layer.
             messages: list[anthropic.types.MessageParam] = [
@@ -133,6 +175,11 @@ class ClaudeProvider(AIProvider):
         except Exception as e:
             raise APICallError(f"Unexpected error during analysis: {e}") from e
 
+    @functools.cached_property
+    def _prompt(self) -> str:
+        """Menu analysis prompt, built on first use and reused for later requests."""
+        return self._build_prompt()
+
     def _build_prompt(self) -> str:
         """
         Build menu analysis prompt using the multilingual prompt builder.
@@ -143,45 +190,11 @@ class ClaudeProvider(AIProvider):
         # Get base prompt from multilingual prompt builder
         base_prompt = self.prompt_builder.build_menu_analysis_prompt()
 
-        # Add number field instructions
-        number_instruction = """
-- number: Dish order number in the menu image (integer, starting from 1)
-  Assign numbers in reading order: top-to-bottom, then left-to-right for multi-column menus.
-  Every dish MUST have a unique sequential number."""
-
-        # Add bounding_box field instructions with improved guidance
-        bounding_box_instruction = """
-- bounding_box: The location of the dish entry in the menu image (REQUIRED for each dish)
-  IMPORTANT: Think of the image as a 1.0 x 1.0 coordinate system where:
-  - (0, 0) is the TOP-LEFT corner of the image
-  - (1, 1) is the BOTTOM-RIGHT corner of the image
-
-  - x: X coordinate of the LEFT edge of the dish entry (0.0 to 1.0)
-  - y: Y coordinate of the TOP edge of the dish entry (0.0 to 1.0)
-  - width: Width of the bounding box (0.0 to 1.0)
-  - height: Height of the bounding box (0.0 to 1.0)
-
-  CRITICAL guidelines for bounding_box:
-  1. The bounding box should tightly enclose ONLY the dish name and its price/description text
-  2. Analyze the vertical position of each dish in the menu from TOP to BOTTOM
-     - First dish on the page should have a smaller y value (closer to 0)
-     - Last dish on the page should have a larger y value (closer to 1)
-  3. For a typical single-column menu:
-     - x is usually around 0.05-0.15 (dishes start near the left edge with some margin)
-     - width is usually around 0.7-0.9 (dishes span most of the width)
-  4. For a multi-column menu:
-     - Left column: x around 0.02-0.1
-     - Right column: x around 0.5-0.55
-  5. Height should match the actual text height of that dish entry (usually 0.03-0.1)
-  6. ALWAYS provide bounding_box coordinates - do not set to null unless truly impossible"""
-
-        extra_instructions = number_instruction + bounding_box_instruction
-
-        # Insert instructions before the output format section
+        # Insert number/bounding_box instructions before the output format section
         if "```json" in base_prompt:
             parts = base_prompt.split("```json")
-            return parts[0] + extra_instructions + "\n\n```json" + parts[1]
-        return base_prompt + extra_instructions
+            return parts[0] + _EXTRA_INSTRUCTIONS + "\n\n```json" + parts[1]
+        return base_prompt + _EXTRA_INSTRUCTIONS
 
     def _parse_response(self, response: str) -> list[Dish]:
         """Parse Claude response into a list of Dish objects."""
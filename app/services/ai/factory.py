@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import threading
+
 from .base import AIProvider, AIProviderError, APIKeyMissingError
 from .claude_provider import ClaudeProvider
 from .openai_provider import OpenAIProvider
@@ -14,19 +16,29 @@ class UnknownProviderError(AIProviderError):
 
 
 class AIProviderFactory:
-    """AIプロバイダーを生成するファクトリークラス."""
+    """AIプロバイダーを生成するファクトリークラス.
+
+    生成したプロバイダーは (クラス, APIキー, 言語) 単位でキャッシュし、
+    SDK クライアントの HTTP コネクションプールをリクエスト間で再利用する。
+    """
 
     _providers: dict[str, type[AIProvider]] = {
         "claude": ClaudeProvider,
         "openai": OpenAIProvider,
     }
 
+    # キャッシュ上限（超えたら最も古いエントリから破棄）
+    MAX_CACHED_PROVIDERS = 32
+
+    _instances: dict[tuple[type[AIProvider], str, str], AIProvider] = {}
+    _instances_lock = threading.Lock()
+
     @classmethod
     def create(
         cls, api_key: str, provider_name: str = "claude", language: str = "en"
     ) -> AIProvider:
         """
-        AIプロバイダーを生成.
+        AIプロバイダーを生成（同一キー・言語の生成済みインスタンスは再利用）.
 
         Args:
             api_key: APIキー
@@ -47,7 +59,26 @@ class AIProviderFactory:
             raise UnknownProviderError(f"Unknown provider: {provider_name}")
 
         provider_class = cls._providers[provider_name]
-        return provider_class(api_key, language=language)
+        key = (provider_class, api_key, language)
+
+        provider = cls._instances.get(key)
+        if provider is not None:
+            return provider
+
+        with cls._instances_lock:
+            provider = cls._instances.get(key)
+            if provider is None:
+                provider = provider_class(api_key, language=language)
+                if len(cls._instances) >= cls.MAX_CACHED_PROVIDERS:
+                    del cls._instances[next(iter(cls._instances))]
+                cls._instances[key] = provider
+        return provider
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """生成済みプロバイダーのキャッシュを破棄."""
+        with cls._instances_lock:
+            cls._instances.clear()
 
     @classmethod
     def register(cls, name: str, provider_class: type[AIProvider]) -> None:
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-import base64
+import functools
 import logging
 import time
 
 import openai
+import pybase64
 from openai import OpenAI
 
 from app.services.ai.base import (
@@ -68,7 +69,7 @@ class OpenAIProvider(AIProvider):
 
     def _call_api(self, image_data: bytes, mime_type: str) -> str:
         """Chat Completions エンドポイントを叩き、レスポンス本文だけ返す。"""
-        image_base64 = base64.standard_b64encode(image_data).decode("utf-8")
+        image_base64 = pybase64.b64encode_as_string(image_data)
         data_url = f"data:{mime_type};base64,{image_base64}"
 
         try:
@@ -79,7 +80,7 @@ class OpenAIProvider(AIProvider):
                     {
                         "role": "user",
                         "content": [
-                            {"type": "text", "text": self._build_prompt()},
+                            {"type": "text", "text": self._prompt},
                             {"type": "image_url", "image_url": {"url": data_url}},
                         ],
                     }
@@ -92,6 +93,11 @@ class OpenAIProvider(AIProvider):
 
         return response.choices[0].message.content or ""
 
+    @functools.cached_property
+    def _prompt(self) -> str:
+        """初回利用時に構築したプロンプト（言語のみに依存するため再利用する）。"""
+        return self._build_prompt()
+
     def _build_prompt(self) -> str:
         """多言語プロンプトに number フィールドの指示を差し込む。"""
         base = self.prompt_builder.build_menu_analysis_prompt()
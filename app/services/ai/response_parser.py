@@ -6,15 +6,22 @@ Claude / OpenAI など複数プロバイダーが同じ JSON 契約（``{"dishes
 
 from __future__ import annotations
 
-import json
 import logging
-from dataclasses import replace
+import re
+
+import orjson
 
 from app.models.dish import Dish
 from app.services.ai.base import APICallError, InvalidMenuImageError
 
 logger = logging.getLogger(__name__)
 
+# 本文先頭の ```json / ``` と末尾の ``` （前後の空白込み）にだけマッチする
+_FENCE_RE = re.compile(r"\A\s*```(?:json)?|```\s*\Z")
+
+# Dish.from_dict が不正な dish で送出しうる例外（dict 以外の要素は AttributeError）
+_DISH_ERRORS = (ValueError, KeyError, TypeError, AttributeError)
+
 
 def parse_dishes(response: str) -> list[Dish]:
     """AI レスポンス本文から Dish のリストを生成する。
@@ -29,25 +36,28 @@ def parse_dishes(response: str) -> list[Dish]:
         有効な Dish のリスト（番号は 1-indexed の連番に正規化済み）
 
     Raises:
-        APICallError: JSON として解釈不能、または ``dishes`` キー欠落
+        APICallError: JSON として解釈不能、``dishes`` キー欠落、または配列でない
         InvalidMenuImageError: 有効な dish が 1 件も得られない
     """
     cleaned = _strip_markdown_fences(response)
 
     try:
-        data = json.loads(cleaned)
-    except json.JSONDecodeError as e:
+        data = orjson.loads(cleaned)
+    except orjson.JSONDecodeError as e:
         raise APICallError(f"Failed to parse JSON response: {e}") from e
 
     if not isinstance(data, dict) or "dishes" not in data:
         raise APICallError("Response must contain 'dishes' key")
 
-    dishes: list[Dish] = []
-    for item in data["dishes"]:
-        try:
-            dishes.append(Dish.from_dict(item))
-        except (ValueError, KeyError, TypeError) as e:
-            logger.warning("Failed to parse dish: %s", e, exc_info=True)
+    items = data["dishes"]
+    if not isinstance(items, list):
+        raise APICallError("'dishes' must be a list")
+
+    try:
+        # 通常は全件有効なので一括変換し、失敗時のみ 1 件ずつ検証し直す
+        dishes = [Dish.from_dict(item) for item in items]
+    except _DISH_ERRORS:
+        dishes = _parse_dishes_skipping_invalid(items)
 
     if not dishes:
         raise InvalidMenuImageError(
@@ -58,16 +68,20 @@ def parse_dishes(response: str) -> list[Dish]:
     return _normalize_dish_numbers(dishes)
 
 
+def _parse_dishes_skipping_invalid(items: list) -> list[Dish]:
+    """1 件ずつ Dish に変換し、不正な dish はログを出してスキップする。"""
+    dishes: list[Dish] = []
+    for item in items:
+        try:
+            dishes.append(Dish.from_dict(item))
+        except _DISH_ERRORS as e:
+            logger.warning("Failed to parse dish: %s", e, exc_info=True)
+    return dishes
+
+
 def _strip_markdown_fences(response: str) -> str:
     """先頭/末尾の markdown コードフェンスを除去した本文を返す。"""
-    cleaned = response.strip()
-    if cleaned.startswith("```json"):
-        cleaned = cleaned[7:]
-    elif cleaned.startswith("```"):
-        cleaned = cleaned[3:]
-    if cleaned.endswith("```"):
-        cleaned = cleaned[:-3]
-    return cleaned.strip()
+    return _FENCE_RE.sub("", response).strip()
 
 
 def _normalize_dish_numbers(dishes: list[Dish]) -> list[Dish]:
@@ -85,6 +99,10 @@ def _normalize_dish_numbers(dishes: list[Dish]) -> list[Dish]:
             "Dish numbers invalid (numbers=%s); reassigning sequential numbers",
             numbers,
         )
-        return [replace(d, number=i + 1) for i, d in enumerate(dishes)]
+        # dishes は parse_dishes が生成したばかりの検証済みインスタンスなので、
+        # replace() で __post_init__ の再検証を走らせず番号だけ書き換える
+        for i, d in enumerate(dishes, start=1):
+            d.number = i
+        return dishes
 
     return sorted(dishes, key=lambda d: d.number)  # type: ignore[arg-type,return-value]
@@ -0,0 +1,103 @@
+"""In-memory LRU cache of menu analysis results.
+
+Re-uploading the same image (common while developing or when a user retries)
+would otherwise repeat a multi-second provider call. Results are keyed by a
+fast non-cryptographic hash of the image, a BLAKE2b digest of the caller's API
+key, and the provider and language that shaped the response.
+
+A cache hit is returned without calling the provider, so the key is never
+validated on that path. The API key digest is what keeps a cached result from
+being served to anyone but the key that paid for it, which is why it uses a
+cryptographic hash rather than xxhash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import xxhash
+
+from app.services.ai.base import AnalysisResult
+
+CacheKey = tuple[int, bytes, str, str]
+
+
+class AnalysisCache:
+    """Thread-safe LRU cache of AnalysisResult objects."""
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of cached results (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[CacheKey, AnalysisResult] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(image_data: bytes, api_key: str, provider_name: str, language: str) -> CacheKey:
+        """
+        Build the cache key for an analysis request.
+
+        Hits skip the provider call and with it API key validation, so the
+        key digest must not collide for different keys.
+
+        Args:
+            image_data: Uploaded image binary data
+            api_key: Caller's provider API key (only its digest is stored)
+            provider_name: AI provider name
+            language: Response language code
+
+        Returns:
+            Cache key
+        """
+        return (
+            xxhash.xxh3_64_intdigest(image_data),
+            hashlib.blake2b(api_key.encode(), digest_size=16).digest(),
+            provider_name,
+            language,
+        )
+
+    def get(self, key: CacheKey) -> AnalysisResult | None:
+        """
+        Look up a cached result and mark it as most recently used.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Cached result, or None on a miss
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: CacheKey, result: AnalysisResult) -> None:
+        """
+        Store a result, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key from make_key()
+            result: Successful analysis result
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
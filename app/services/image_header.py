@@ -0,0 +1,112 @@
+"""Header-only image format detection.
+
+Upload validation only needs to know that the bytes are a PNG, JPEG or WebP
+image with sane dimensions, so the headers are parsed directly instead of
+instantiating a Pillow decoder.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_JPEG_SOI = b"\xff\xd8"
+_RIFF_SIGNATURE = b"RIFF"
+_WEBP_FOURCC = b"WEBP"
+_VP8_START_CODE = b"\x9d\x01\x2a"
+_VP8L_SIGNATURE = 0x2F
+
+# SOF0-SOF15 carry the frame dimensions; C4 (DHT), C8 (JPG) and CC (DAC) do not
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field (TEM, RST0-7)
+_JPEG_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD8)})
+
+
+@dataclass(frozen=True, slots=True)
+class ImageHeader:
+    """Format and size read from an image header.
+
+    Attributes:
+        mime_type: Detected MIME type
+        width: Width in pixels
+        height: Height in pixels
+    """
+
+    mime_type: str
+    width: int
+    height: int
+
+
+def sniff_image(image_data: bytes) -> ImageHeader | None:
+    """Detect a PNG, JPEG or WebP image from its header.
+
+    Args:
+        image_data: Image binary data
+
+    Returns:
+        Detected header, or None if the data is not a supported image or
+        its header is truncated/corrupt
+    """
+    if image_data.startswith(_PNG_SIGNATURE):
+        header = _sniff_png(image_data)
+    elif image_data.startswith(_JPEG_SOI):
+        header = _sniff_jpeg(image_data)
+    elif image_data.startswith(_RIFF_SIGNATURE) and image_data[8:12] == _WEBP_FOURCC:
+        header = _sniff_webp(image_data)
+    else:
+        return None
+
+    if header is None or header.width == 0 or header.height == 0:
+        return None
+    return header
+
+
+def _sniff_png(data: bytes) -> ImageHeader | None:
+    """Read dimensions from the PNG IHDR chunk."""
+    if len(data) < 24 or data[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack_from(">II", data, 16)
+    return ImageHeader("image/png", width, height)
+
+
+def _sniff_jpeg(data: bytes) -> ImageHeader | None:
+    """Walk JPEG markers up to the first SOF segment and read its dimensions."""
+    size = len(data)
+    i = 2
+    while i + 4 <= size:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            i += 2
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            if i + 9 > size:
+                return None
+            height, width = struct.unpack_from(">HH", data, i + 5)
+            return ImageHeader("image/jpeg", width, height)
+        if marker in (0xD9, 0xDA):  # EOI / SOS before any SOF
+            return None
+        (segment_length,) = struct.unpack_from(">H", data, i + 2)
+        i += 2 + segment_length
+    return None
+
+
+def _sniff_webp(data: bytes) -> ImageHeader | None:
+    """Read dimensions from the first WebP chunk (VP8, VP8L or VP8X)."""
+    chunk = data[12:16]
+    if chunk == b"VP8 " and len(data) >= 30 and data[23:26] == _VP8_START_CODE:
+        width, height = struct.unpack_from("<HH", data, 26)
+        return ImageHeader("image/webp", width & 0x3FFF, height & 0x3FFF)
+    if chunk == b"VP8L" and len(data) >= 25 and data[20] == _VP8L_SIGNATURE:
+        (bits,) = struct.unpack_from("<I", data, 21)
+        return ImageHeader("image/webp", (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+    if chunk == b"VP8X" and len(data) >= 30:
+        width = int.from_bytes(data[24:27], "little") + 1
+        height = int.from_bytes(data[27:30], "little") + 1
+        return ImageHeader("image/webp", width, height)
+    return None
@@ -0,0 +1,100 @@
+"""Downscaling of uploads to the resolution a vision model actually uses.
+
+Images whose long edge exceeds the provider's input limit are resized by the
+provider anyway, so sending them at full size only costs upload bandwidth,
+base64 work and tokens. Only those images are decoded; everything else passes
+through untouched.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+from app.services.image_header import sniff_image
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+JPEG_QUALITY = 85
+
+# Largest image we are willing to decode (a few KB of PNG can claim 12000x12000,
+# which takes close to 1 GB to decode)
+MAX_DECODE_PIXELS = 50_000_000
+
+
+def downscale_image(image_data: bytes, mime_type: str, max_edge: int) -> tuple[bytes, str]:
+    """Shrink an image so that its long edge fits within ``max_edge``.
+
+    Args:
+        image_data: Image binary data
+        mime_type: Image MIME type
+        max_edge: Longest edge, in pixels, to send to the provider
+
+    Returns:
+        Tuple of (image data, MIME type); the input unchanged if it is already
+        small enough, too large to decode safely or cannot be decoded,
+        otherwise a re-encoded JPEG
+    """
+    header = sniff_image(image_data)
+    if header is None or max(header.width, header.height) <= max_edge:
+        return image_data, mime_type
+    if header.width * header.height > MAX_DECODE_PIXELS:
+        # Never decode it here; the provider rejects what it cannot take
+        logger.warning("Not downscaling %dx%d image: too many pixels", header.width, header.height)
+        return image_data, mime_type
+
+    # Deferred: Pillow is only needed for the few uploads that are actually resized
+    from PIL import Image, ImageOps
+
+    scale = max_edge / max(header.width, header.height)
+    target_size = (math.ceil(header.width * scale), math.ceil(header.height * scale))
+
+    try:
+        with Image.open(BytesIO(image_data)) as img:
+            # JPEG: let the decoder scale by 1/2, 1/4 or 1/8 during DCT instead of at full size
+            img.draft("RGB", target_size)
+            # The re-encoded JPEG carries no EXIF, so bake the orientation into the pixels
+            resized = _flatten_to_rgb(ImageOps.exif_transpose(img))
+    except (OSError, SyntaxError, Image.DecompressionBombError) as e:
+        # Undecodable here; leave it to the provider to accept or reject
+        logger.warning("Could not downscale image: %s", e)
+        return image_data, mime_type
+    resized.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+    buffer = BytesIO()
+    resized.save(buffer, format="JPEG", quality=JPEG_QUALITY)
+    logger.info(
+        "Downscaled image %dx%d -> %dx%d",
+        header.width,
+        header.height,
+        resized.width,
+        resized.height,
+    )
+    return buffer.getvalue(), "image/jpeg"
+
+
+def _flatten_to_rgb(img: Image.Image) -> Image.Image:
+    """Convert to RGB, compositing any transparency onto a white background.
+
+    A plain ``convert("RGB")`` drops the alpha channel, which turns transparent
+    areas black and hides dark text on transparent screenshots.
+
+    Args:
+        img: Decoded image in any mode
+
+    Returns:
+        RGB image
+    """
+    from PIL import Image
+
+    if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return img.convert("RGB")
@@ -0,0 +1,23 @@
+"""Gunicorn configuration (loaded automatically from the working directory).
+
+/api/analyze spends seconds waiting on the AI provider, so each worker runs a
+thread pool to keep several provider calls in flight instead of blocking the
+worker on one request at a time.
+"""
+
+import logging
+import os
+
+worker_class = "gthread"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+
+# Must exceed the slowest provider round-trip (large menus take 30s+)
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+
+
+def post_worker_init(worker):
+    """Start the background log writer in each worker once the app is loaded."""
+    from app.logging_setup import configure_logging
+
+    configure_logging(logging.DEBUG if os.environ.get("FLASK_DEBUG") == "1" else logging.INFO)
@@ -5,6 +5,7 @@ This module serves as the entry point for running the Flask application.
 It loads environment variables and starts the development server.
 """
 
+import logging
 import os
 
 from dotenv import load_dotenv
@@ -13,6 +14,10 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from app import create_app  # noqa: E402 (must load .env first)
+from app.logging_setup import configure_logging  # noqa: E402
+
+# Logging is process-wide, so it is set up here rather than in the app factory
+configure_logging(logging.DEBUG if os.environ.get("FLASK_DEBUG") == "1" else logging.INFO)
 
 app = create_app()
 
@@ -2,19 +2,39 @@
 
 import base64
 from io import BytesIO
+from unittest.mock import Mock
 
+import anthropic
 import pytest
+from jinja2 import FileSystemBytecodeCache
 from PIL import Image
 
 from app import create_app
 from app.models.dish import Category, Dish
 from app.services.ai.base import AnalysisResult
+from app.services.ai.factory import AIProviderFactory
 
 
-@pytest.fixture
-def app():
+@pytest.fixture(autouse=True)
+def _reset_provider_cache():
+    """テストごとに AIProviderFactory のインスタンスキャッシュを空にする.
+
+    キャッシュはプロセス全体で共有されるため、残しておくと結果が
+    実行順や xdist のワーカー分配に左右される。
+    """
+    yield
+    AIProviderFactory.clear_cache()
+
+
+@pytest.fixture(scope="session")
+def app(pytestconfig):
     """Create and configure a test application instance.
 
+    Built once per session: tests only read its config or issue requests,
+    and per-request state (the analysis cache) is reset by ``client``.
+    Compiled templates are cached under .pytest_cache so later runs and
+    other xdist workers load them instead of recompiling.
+
     Yields:
         Flask application configured for testing.
     """
@@ -24,6 +44,9 @@ def app():
             "SECRET_KEY": "test-secret-key",
         }
     )
+    cache = getattr(pytestconfig, "cache", None)  # None with -p no:cacheprovider
+    if cache is not None:
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(str(cache.mkdir("jinja")))
     yield app
 
 
@@ -40,6 +63,9 @@ def client(app):
     Returns:
         Flask test client with X-API-Key set on every request.
     """
+    # The session-wide app keeps analysis results; start each test from a cold cache
+    app.extensions["analysis_cache"].clear()
+
     test_client = app.test_client()
     original_open = test_client.open
 
@@ -55,10 +81,12 @@ def client(app):
     return test_client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_image():
     """Create a sample test image.
 
+    The tuple of bytes and str is immutable, so one instance serves the session.
+
     Returns:
         Tuple of (image_data: bytes, mime_type: str)
     """
@@ -103,18 +131,19 @@ def mock_claude_response():
 ```"""
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def real_menu_image():
     """テスト用のメニュー画像を生成（統合テスト用）.
 
+    bytes は不変なのでセッション内で一度だけエンコードして共有する。
+
     Returns:
         bytes: JPEG形式の画像データ
     """
     img = Image.new("RGB", (800, 600), color="white")
     buffer = BytesIO()
     img.save(buffer, format="JPEG")
-    buffer.seek(0)
-    return buffer.read()
+    return buffer.getvalue()
 
 
 @pytest.fixture
@@ -137,3 +166,68 @@ def mock_analysis_result():
         )
     ]
     return AnalysisResult(dishes=dishes, raw_response="...", provider="claude", processing_time=1.5)
+
+
+@pytest.fixture(scope="session")
+def pad_thai_result():
+    """パッタイ 1 品の解析結果（ルートテストの正常系で共有）.
+
+    プロバイダーのモック戻り値として読むだけなので、セッション内で一度だけ生成する。
+
+    Returns:
+        AnalysisResult: パッタイ 1 品を含む解析結果
+    """
+    return AnalysisResult(
+        dishes=[
+            Dish(
+                original_name="Pad Thai",
+                translated_name="パッタイ",
+                description="米麺を使ったタイ風焼きそば",
+                spiciness=2,
+                sweetness=3,
+                ingredients=["米麺", "エビ", "卵", "もやし", "ピーナッツ"],
+                allergens=["甲殻類", "卵", "ナッツ"],
+                category=Category.MAIN,
+            )
+        ],
+        raw_response="mock response",
+        provider="claude",
+        processing_time=1.5,
+    )
+
+
+@pytest.fixture(scope="session")
+def anthropic_api_error():
+    """Anthropic クライアントのモックに送出させる APIError（セッション内で共有）.
+
+    Returns:
+        anthropic.APIError: ダミーリクエストを持つ APIError
+    """
+    return anthropic.APIError(message="API Error", request=Mock(), body=None)
+
+
+@pytest.fixture
+def mock_ai_factory(mock_analysis_result, monkeypatch):
+    """AIProviderFactory.create がモックプロバイダーを返すようにする.
+
+    Returns:
+        Mock: analyze_menu が mock_analysis_result を返すモックプロバイダー
+    """
+    provider = Mock()
+    provider.analyze_menu.return_value = mock_analysis_result
+    monkeypatch.setattr(AIProviderFactory, "create", Mock(return_value=provider))
+    return provider
+
+
+@pytest.fixture
+def small_upload_limit(app, monkeypatch):
+    """このテストの間だけ MAX_CONTENT_LENGTH を 1KB に下げる.
+
+    413 のテストで上限超えのボディを作るのに 10MB を確保しなくて済む。
+
+    Returns:
+        int: 一時的な MAX_CONTENT_LENGTH
+    """
+    limit = 1024
+    monkeypatch.setitem(app.config, "MAX_CONTENT_LENGTH", limit)
+    return limit
@@ -0,0 +1,56 @@
+"""Tests for the in-memory analysis result cache."""
+
+import hashlib
+
+from app.services.ai.base import AnalysisResult
+from app.services.analysis_cache import AnalysisCache
+
+
+def _result(provider: str = "mock") -> AnalysisResult:
+    return AnalysisResult(dishes=[], raw_response="", provider=provider, processing_time=1.0)
+
+
+class TestAnalysisCache:
+    def test_key_depends_on_image_provider_and_language(self):
+        key = AnalysisCache.make_key(b"image", "sk-a", "claude", "en")
+        assert key == AnalysisCache.make_key(b"image", "sk-a", "claude", "en")
+        assert key != AnalysisCache.make_key(b"other", "sk-a", "claude", "en")
+        assert key != AnalysisCache.make_key(b"image", "sk-a", "openai", "en")
+        assert key != AnalysisCache.make_key(b"image", "sk-a", "claude", "ja")
+        assert key != AnalysisCache.make_key(b"image", "sk-b", "claude", "en")
+
+    def test_api_key_is_stored_as_a_blake2b_digest(self):
+        key = AnalysisCache.make_key(b"image", "sk-a", "claude", "en")
+        assert key[1] == hashlib.blake2b(b"sk-a", digest_size=16).digest()
+        assert "sk-a" not in key
+
+    def test_get_returns_stored_result(self):
+        cache = AnalysisCache()
+        key = cache.make_key(b"image", "sk-a", "claude", "en")
+        result = _result()
+        assert cache.get(key) is None
+        cache.put(key, result)
+        assert cache.get(key) is result
+
+    def test_evicts_least_recently_used(self):
+        cache = AnalysisCache(maxsize=2)
+        a, b, c = (cache.make_key(data, "sk-a", "claude", "en") for data in (b"a", b"b", b"c"))
+        cache.put(a, _result("a"))
+        cache.put(b, _result("b"))
+        cache.get(a)
+        cache.put(c, _result("c"))
+        assert len(cache) == 2
+        assert cache.get(b) is None
+        assert cache.get(a) is not None
+
+    def test_zero_maxsize_disables_cache(self):
+        cache = AnalysisCache(maxsize=0)
+        key = cache.make_key(b"image", "sk-a", "claude", "en")
+        cache.put(key, _result())
+        assert cache.get(key) is None
+
+    def test_clear(self):
+        cache = AnalysisCache()
+        cache.put(cache.make_key(b"image", "sk-a", "claude", "en"), _result())
+        cache.clear()
+        assert len(cache) == 0
@@ -0,0 +1,48 @@
+"""Tests for AppEnv environment parsing."""
+
+import dataclasses
+
+import pytest
+
+from app.app_env import DEFAULT_MAX_UPLOAD_SIZE, AppEnv
+
+
+def test_from_environ_defaults():
+    """Test that an empty environment yields development defaults."""
+    app_env = AppEnv.from_environ({})
+
+    assert app_env == AppEnv(
+        secret_key=None, env=None, flask_debug=False, max_upload_size=DEFAULT_MAX_UPLOAD_SIZE
+    )
+    assert app_env.is_production is False
+
+
+def test_from_environ_reads_all_values():
+    """Test that every supported variable is parsed."""
+    app_env = AppEnv.from_environ(
+        {
+            "SECRET_KEY": "key",
+            "ENV": "production",
+            "FLASK_DEBUG": "0",
+            "MAX_UPLOAD_SIZE": "1024",
+        }
+    )
+
+    assert app_env.secret_key == "key"
+    assert app_env.is_production is True
+    assert app_env.flask_debug is False
+    assert app_env.max_upload_size == 1024
+
+
+def test_from_environ_treats_empty_secret_key_as_unset():
+    """Test that an empty SECRET_KEY is rejected in production like a missing one."""
+    with pytest.raises(ValueError, match="SECRET_KEY must be set in production"):
+        AppEnv.from_environ({"ENV": "production", "SECRET_KEY": ""})
+
+
+def test_app_env_is_frozen():
+    """Test that the parsed settings cannot be modified."""
+    app_env = AppEnv.from_environ({})
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        app_env.flask_debug = True  # type: ignore[misc]
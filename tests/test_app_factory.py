@@ -1,17 +1,26 @@
 """Tests for the application factory."""
 
+import re
 from pathlib import Path
 
 import pytest
+from flask import Flask
 
 from app import create_app
 
+# Environment variables read by create_app
+_APP_ENV_VARS = ("ENV", "SECRET_KEY", "FLASK_DEBUG", "MAX_UPLOAD_SIZE")
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    """Start every test with none of the factory's environment variables set."""
+    for name in _APP_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+
 
 def test_create_app_returns_flask_instance(monkeypatch):
     """Test that create_app returns a Flask application instance."""
-    monkeypatch.delenv("ENV", raising=False)
-    monkeypatch.delenv("SECRET_KEY", raising=False)
-
     app = create_app()
 
     assert app is not None
@@ -20,9 +29,6 @@ def test_create_app_returns_flask_instance(monkeypatch):
 
 def test_create_app_with_custom_config(monkeypatch):
     """Test that create_app accepts custom configuration."""
-    monkeypatch.delenv("ENV", raising=False)
-    monkeypatch.delenv("SECRET_KEY", raising=False)
-
     custom_config = {
         "TESTING": True,
         "SECRET_KEY": "custom-test-key",
@@ -36,13 +42,10 @@ def test_create_app_with_custom_config(monkeypatch):
 def test_create_app_requires_secret_key_in_production(monkeypatch):
     """Test that SECRET_KEY is required in production environment."""
     monkeypatch.setenv("ENV", "production")
-    monkeypatch.delenv("SECRET_KEY", raising=False)
 
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match="SECRET_KEY must be set in production"):
         create_app()
 
-    assert "SECRET_KEY must be set in production" in str(exc_info.value)
-
 
 def test_create_app_uses_secret_key_from_env(monkeypatch):
     """Test that SECRET_KEY is loaded from environment variable."""
@@ -56,7 +59,6 @@ def test_create_app_works_in_production_with_secret_key(monkeypatch):
     """Test that app starts in production when SECRET_KEY is set."""
     monkeypatch.setenv("ENV", "production")
     monkeypatch.setenv("SECRET_KEY", "production-secret-key")
-    monkeypatch.delenv("FLASK_DEBUG", raising=False)
 
     app = create_app()
 
@@ -69,11 +71,9 @@ def test_create_app_rejects_debug_mode_in_production(monkeypatch):
     monkeypatch.setenv("SECRET_KEY", "production-secret-key")
     monkeypatch.setenv("FLASK_DEBUG", "1")
 
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match="DEBUG mode must be disabled in production"):
         create_app()
 
-    assert "DEBUG mode must be disabled in production" in str(exc_info.value)
-
 
 def test_max_upload_size_from_env(monkeypatch):
     """Test that MAX_UPLOAD_SIZE is loaded from environment variable."""
@@ -85,7 +85,6 @@ def test_max_upload_size_from_env(monkeypatch):
 
 def test_max_upload_size_default(monkeypatch):
     """Test that MAX_UPLOAD_SIZE defaults to 10MB."""
-    monkeypatch.delenv("MAX_UPLOAD_SIZE", raising=False)
     app = create_app()
 
     assert app.config["MAX_CONTENT_LENGTH"] == 10 * 1024 * 1024
@@ -93,22 +92,21 @@ def test_max_upload_size_default(monkeypatch):
 
 def test_blueprint_is_registered(monkeypatch):
     """Test that main blueprint is registered."""
-    monkeypatch.delenv("ENV", raising=False)
-    monkeypatch.delenv("SECRET_KEY", raising=False)
-
     app = create_app()
 
     assert "main" in app.blueprints
 
 
-def test_upload_folder_is_created(monkeypatch):
+def test_upload_folder_is_created(monkeypatch, tmp_path):
     """Test that UPLOAD_FOLDER directory is created."""
-    monkeypatch.delenv("ENV", raising=False)
-    monkeypatch.delenv("SECRET_KEY", raising=False)
+    # Use a fresh instance directory so the folder really is created by this call
+    instance_path = tmp_path / "instance"
+    monkeypatch.setattr(Flask, "auto_find_instance_path", lambda self: str(instance_path))
 
     app = create_app()
 
     upload_folder = Path(app.config["UPLOAD_FOLDER"])
+    assert upload_folder == instance_path / "uploads"
     assert upload_folder.exists()
     assert upload_folder.is_dir()
 
@@ -131,34 +129,33 @@ def test_custom_config_overrides_max_content_length(monkeypatch):
     assert app.config["MAX_CONTENT_LENGTH"] == 1024
 
 
-def test_max_upload_size_invalid_value_raises_error(monkeypatch):
-    """Test that invalid MAX_UPLOAD_SIZE raises ValueError."""
-    monkeypatch.setenv("MAX_UPLOAD_SIZE", "invalid")
-
-    with pytest.raises(ValueError) as exc_info:
-        create_app()
-
-    assert "MAX_UPLOAD_SIZE must be a valid integer" in str(exc_info.value)
-    assert "'invalid'" in str(exc_info.value)
-
+@pytest.mark.parametrize(
+    ("raw_value", "expected_message"),
+    [
+        ("invalid", "MAX_UPLOAD_SIZE must be a valid integer, got: 'invalid'"),
+        ("-1", "MAX_UPLOAD_SIZE must be a positive integer, got: -1"),
+        ("0", "MAX_UPLOAD_SIZE must be a positive integer, got: 0"),
+    ],
+)
+def test_max_upload_size_bad_value_raises_error(monkeypatch, raw_value, expected_message):
+    """Test that non-integer or non-positive MAX_UPLOAD_SIZE raises ValueError."""
+    monkeypatch.setenv("MAX_UPLOAD_SIZE", raw_value)
 
-def test_max_upload_size_negative_value_raises_error(monkeypatch):
-    """Test that negative MAX_UPLOAD_SIZE raises ValueError."""
-    monkeypatch.setenv("MAX_UPLOAD_SIZE", "-1")
-
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=re.escape(expected_message)):
         create_app()
 
-    assert "MAX_UPLOAD_SIZE must be a positive integer" in str(exc_info.value)
-    assert "-1" in str(exc_info.value)
-
 
 def test_upload_folder_outside_instance_raises_error(monkeypatch):
     """Test that UPLOAD_FOLDER outside instance directory is rejected."""
-    monkeypatch.delenv("ENV", raising=False)
-    monkeypatch.delenv("SECRET_KEY", raising=False)
-
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match="must be within instance directory"):
         create_app({"UPLOAD_FOLDER": "/tmp/uploads"})
 
-    assert "must be within instance directory" in str(exc_info.value)
+
+def test_upload_folder_override_within_instance_is_accepted(monkeypatch):
+    """Test that an UPLOAD_FOLDER override inside the instance directory is allowed."""
+    probe = create_app()
+    upload_folder = Path(probe.instance_path) / "uploads"
+
+    app = create_app({"UPLOAD_FOLDER": upload_folder})
+
+    assert app.config["UPLOAD_FOLDER"] == upload_folder
@@ -8,7 +8,9 @@ from app import create_app
 
 
 class TestMkdirFailure:
-    def test_instance_path_mkdir_failure_raises_runtime_error(self):
+    def test_instance_path_mkdir_failure_raises_runtime_error(self, monkeypatch):
+        # Directories ensured by earlier tests would otherwise skip mkdir entirely
+        monkeypatch.setattr("app._ensured_dirs", set())
         with (
             patch("app.Path.mkdir", side_effect=OSError("disk full")),
             pytest.raises(RuntimeError, match="Failed to create required directories"),
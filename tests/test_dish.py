@@ -4,6 +4,51 @@ import pytest
 
 from app.models import Category, Dish
 
+# バリデーションテスト用の最小構成（各ケースは 1 フィールドだけ上書きする）
+_MINIMAL_DISH_KWARGS = {
+    "original_name": "Test",
+    "translated_name": "テスト",
+    "description": "テスト料理",
+    "spiciness": 3,
+    "sweetness": 3,
+}
+
+# (フィールド, 値, 例外, メッセージ)
+_INVALID_FIELD_CASES = [
+    *[
+        (field, value, ValueError, f"{field} must be 1-5, got {value}")
+        for field in ("spiciness", "sweetness")
+        for value in (0, -1, 6, 10)
+    ],
+    # bool は int のサブクラスだが除外する
+    *[
+        (field, True, TypeError, f"{field} must be an integer")
+        for field in ("spiciness", "sweetness")
+    ],
+    *[
+        ("number", value, ValueError, f"number must be >= 1, got {value}")
+        for value in (0, -1, -100)
+    ],
+    *[
+        ("number", value, TypeError, "number must be an integer")
+        for value in ("1", 1.5, True, False)
+    ],
+]
+
+# ラウンドトリップ用の料理（モジュール読み込み時に一度だけ生成、変更しないこと）
+_TOM_YUM = Dish(
+    original_name="Tom Yum Goong",
+    translated_name="トムヤムクン",
+    description="辛酸っぱいタイのスープ",
+    spiciness=4,
+    sweetness=2,
+    ingredients=["エビ", "レモングラス", "唐辛子"],
+    allergens=["甲殻類"],
+    category=Category.MAIN,
+    image_url="https://example.com/tom-yum.jpg",
+    number=2,
+)
+
 
 class TestDish:
     """Dishクラスのテスト"""
@@ -47,29 +92,13 @@ class TestDish:
         assert dish.category == Category.OTHER
         assert dish.image_url is None
 
-    @pytest.mark.parametrize("spiciness", [0, -1, 6, 10])
-    def test_spiciness_validation_fails(self, spiciness: int) -> None:
-        """spiciness が範囲外の場合にエラーが発生"""
-        with pytest.raises(ValueError, match=f"spiciness must be 1-5, got {spiciness}"):
-            Dish(
-                original_name="Test",
-                translated_name="テスト",
-                description="テスト料理",
-                spiciness=spiciness,
-                sweetness=3,
-            )
-
-    @pytest.mark.parametrize("sweetness", [0, -1, 6, 10])
-    def test_sweetness_validation_fails(self, sweetness: int) -> None:
-        """sweetness が範囲外の場合にエラーが発生"""
-        with pytest.raises(ValueError, match=f"sweetness must be 1-5, got {sweetness}"):
-            Dish(
-                original_name="Test",
-                translated_name="テスト",
-                description="テスト料理",
-                spiciness=3,
-                sweetness=sweetness,
-            )
+    @pytest.mark.parametrize(("field", "value", "error", "message"), _INVALID_FIELD_CASES)
+    def test_field_validation_fails(
+        self, field: str, value: object, error: type[Exception], message: str
+    ) -> None:
+        """spiciness / sweetness / number の型・範囲が不正な場合にエラーが発生"""
+        with pytest.raises(error, match=message):
+            Dish(**{**_MINIMAL_DISH_KWARGS, field: value})  # type: ignore[arg-type]
 
     @pytest.mark.parametrize("spiciness,sweetness", [(1, 1), (3, 3), (5, 5)])
     def test_boundary_values(self, spiciness: int, sweetness: int) -> None:
@@ -196,68 +225,17 @@ class TestDish:
 
     def test_roundtrip_to_dict_from_dict(self) -> None:
         """to_dictとfrom_dictのラウンドトリップテスト"""
-        original_dish = Dish(
-            original_name="Tom Yum Goong",
-            translated_name="トムヤムクン",
-            description="辛酸っぱいタイのスープ",
-            spiciness=4,
-            sweetness=2,
-            ingredients=["エビ", "レモングラス", "唐辛子"],
-            allergens=["甲殻類"],
-            category=Category.MAIN,
-            image_url="https://example.com/tom-yum.jpg",
-            number=2,
-        )
+        data = _TOM_YUM.to_dict()
 
-        # to_dict -> from_dict
-        data = original_dish.to_dict()
-        restored_dish = Dish.from_dict(data)
-
-        # すべてのフィールドが一致することを確認
-        assert restored_dish.original_name == original_dish.original_name
-        assert restored_dish.translated_name == original_dish.translated_name
-        assert restored_dish.description == original_dish.description
-        assert restored_dish.spiciness == original_dish.spiciness
-        assert restored_dish.sweetness == original_dish.sweetness
-        assert restored_dish.ingredients == original_dish.ingredients
-        assert restored_dish.allergens == original_dish.allergens
-        assert restored_dish.category == original_dish.category
-        assert restored_dish.image_url == original_dish.image_url
-        assert restored_dish.number == original_dish.number
-
-    @pytest.mark.parametrize("number", [0, -1, -100])
-    def test_number_validation_fails_on_non_positive(self, number: int) -> None:
-        """numberが0以下の場合にValueErrorが発生"""
-        with pytest.raises(ValueError, match=f"number must be >= 1, got {number}"):
-            Dish(
-                original_name="Test",
-                translated_name="テスト",
-                description="テスト料理",
-                spiciness=3,
-                sweetness=3,
-                number=number,
-            )
-
-    @pytest.mark.parametrize("number", ["1", 1.5, True, False])
-    def test_number_validation_fails_on_invalid_type(self, number: object) -> None:
-        """numberが非int型の場合にTypeErrorが発生（boolも除外）"""
-        with pytest.raises(TypeError, match="number must be an integer"):
-            Dish(
-                original_name="Test",
-                translated_name="テスト",
-                description="テスト料理",
-                spiciness=3,
-                sweetness=3,
-                number=number,  # type: ignore[arg-type]
-            )
+        # すべてのフィールドが一致することを確認（dataclass の __eq__ で全フィールド比較）
+        assert Dish.from_dict(data) == _TOM_YUM
+
+    def test_dish_uses_slots(self) -> None:
+        """slots=Trueにより__dict__を持たない"""
+        dish = Dish(**_MINIMAL_DISH_KWARGS)
+        assert not hasattr(dish, "__dict__")
 
     def test_number_none_is_allowed(self) -> None:
         """numberがNone（デフォルト）の場合は有効"""
-        dish = Dish(
-            original_name="Test",
-            translated_name="テスト",
-            description="テスト料理",
-            spiciness=3,
-            sweetness=3,
-        )
+        dish = Dish(**_MINIMAL_DISH_KWARGS)
         assert dish.number is None
@@ -1,23 +1,53 @@
 """dish_card.html コンポーネントのテスト"""
 
+import copy
 import re
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from typing import Any
 
 import pytest
-from flask import Flask, render_template, render_template_string
+from flask import Flask, render_template
+from jinja2 import Template
 
-from app import create_app
 from app.models.dish import Category, Dish
 
+DISH_CARD_TEMPLATE = """
+{% from 'components/dish_card.html' import dish_card %}
+{{ dish_card(dish) }}
+"""
 
-@pytest.fixture
-def app() -> Flask:
-    """テスト用のFlaskアプリケーション（t()などのJinja2グローバルを含む）"""
-    return create_app({"TESTING": True, "SECRET_KEY": "test-secret-key"})
+
+@pytest.fixture(scope="module", autouse=True)
+def _request_context(app: Flask) -> Iterator[None]:
+    """モジュール内のテストで共有するリクエストコンテキスト（テストごとの push/pop を省く）"""
+    with app.test_request_context():
+        yield
 
 
-@pytest.fixture
-def sample_dish() -> Dish:
-    """テスト用のサンプル料理データ"""
+@pytest.fixture(scope="session")
+def dish_card_template(app: Flask) -> Template:
+    """dish_card マクロを呼ぶテンプレート（セッション内で一度だけコンパイル）"""
+    return app.jinja_env.from_string(DISH_CARD_TEMPLATE)
+
+
+def _render(app: Flask, template: Template, **context: Any) -> str:
+    """コンパイル済みテンプレートを render_template_string と同じコンテキストで描画"""
+    app.update_template_context(context)
+    return template.render(context)
+
+
+def _class_counts(html: str, classes: Iterable[str]) -> Counter[str]:
+    """html 中の各クラス名の出現回数を 1 回の走査で数える"""
+    # 長い名前を先に試し、部分一致する短い名前に食われないようにする
+    alternatives = sorted(classes, key=len, reverse=True)
+    pattern = re.compile("|".join(map(re.escape, alternatives)))
+    return Counter(pattern.findall(html))
+
+
+@pytest.fixture(scope="session")
+def _base_dish() -> Dish:
+    """テスト用のサンプル料理データ（共有されるため変更しないこと）"""
     return Dish(
         original_name="Pad Thai",
         translated_name="パッタイ",
@@ -30,78 +60,72 @@ def sample_dish() -> Dish:
     )
 
 
-def test_dish_card_renders_basic_info(app: Flask, sample_dish: Dish) -> None:
+@pytest.fixture
+def sample_dish(_base_dish: Dish) -> Dish:
+    """_base_dish のコピー（属性を書き換えるテスト用）"""
+    return copy.deepcopy(_base_dish)
+
+
+def test_dish_card_renders_basic_info(
+    app: Flask, dish_card_template: Template, _base_dish: Dish
+) -> None:
     """料理カードが基本情報を表示することを確認"""
-    with app.test_request_context():
-        template = """
-        {% from 'components/dish_card.html' import dish_card %}
-        {{ dish_card(dish) }}
-        """
-        html = render_template_string(template, dish=sample_dish)
+    html = _render(app, dish_card_template, dish=_base_dish)
 
-        # 料理名が表示される
-        assert "パッタイ" in html
-        assert "Pad Thai" in html
+    # 料理名が表示される
+    assert "パッタイ" in html
+    assert "Pad Thai" in html
 
-        # 説明が表示される
-        assert "米麺を使ったタイ風焼きそば" in html
+    # 説明が表示される
+    assert "米麺を使ったタイ風焼きそば" in html
 
 
-def test_dish_card_renders_spiciness_indicator(app: Flask, sample_dish: Dish) -> None:
+def test_dish_card_renders_spiciness_indicator(
+    app: Flask, dish_card_template: Template, _base_dish: Dish
+) -> None:
     """辛さインジケーターが表示されることを確認"""
-    with app.test_request_context():
-        template = """
-        {% from 'components/dish_card.html' import dish_card %}
-        {{ dish_card(dish) }}
-        """
-        html = render_template_string(template, dish=sample_dish)
+    html = _render(app, dish_card_template, dish=_base_dish)
 
-        # 辛さの絵文字が表示される
-        assert "🌶️" in html
+    # 辛さの絵文字が表示される
+    assert "🌶️" in html
 
-        # 辛さレベル2なので、bg-red-500が2つ、bg-slate-200が3つ
-        assert html.count("bg-red-500") >= 2
-        assert html.count("bg-slate-200") >= 3
+    # 辛さレベル2なので、bg-red-500が2つ、bg-slate-200が3つ
+    counts = _class_counts(html, ["bg-red-500", "bg-slate-200"])
+    assert counts["bg-red-500"] >= 2
+    assert counts["bg-slate-200"] >= 3
 
 
-def test_dish_card_renders_sweetness_indicator(app: Flask, sample_dish: Dish) -> None:
+def test_dish_card_renders_sweetness_indicator(
+    app: Flask, dish_card_template: Template, _base_dish: Dish
+) -> None:
     """甘さインジケーターが表示されることを確認"""
-    with app.test_request_context():
-        template = """
-        {% from 'components/dish_card.html' import dish_card %}
-        {{ dish_card(dish) }}
-        """
-        html = render_template_string(template, dish=sample_dish)
+    html = _render(app, dish_card_template, dish=_base_dish)
 
-        # 甘さの絵文字が表示される
-        assert "🍯" in html
+    # 甘さの絵文字が表示される
+    assert "🍯" in html
 
-        # 甘さレベル3なので、bg-amber-500が3つ
-        assert html.count("bg-amber-500") >= 3
+    # 甘さレベル3なので、bg-amber-500が3つ
+    counts = _class_counts(html, ["bg-amber-500"])
+    assert counts["bg-amber-500"] >= 3
 
 
-def test_dish_card_renders_ingredients(app: Flask, sample_dish: Dish) -> None:
+def test_dish_card_renders_ingredients(
+    app: Flask, dish_card_template: Template, _base_dish: Dish
+) -> None:
     """材料タグが表示されることを確認"""
-    with app.test_request_context():
-        template = """
-        {% from 'components/dish_card.html' import dish_card %}
-        {{ dish_card(dish) }}
-        """
-        html = render_template_string(template, dish=sample_dish)
+    html = _render(app, dish_card_template, dish=_base_dish)
 
-        # 各材料が表示される
-        for ingredient in sample_dish.ingredients:
-            assert ingredient in html
+    # 各材料が表示される
+    for ingredient in _base_dish.ingredients:
+        assert ingredient in html
 
 
-def test_dish_card_renders_allergens(app: Flask, sample_dish: Dish) -> None:
+def test_dish_card_renders_allergens(
+    app: Flask, dish_card_template: Template, _base_dish: Dish
+) -> None:
     """アレルギー情報が表示されることを確認（日本語i18nコンテキストで）"""
     with app.test_request_context("/?lang=ja"):
-        template = """
-        {% from 'components/dish_card.html' import dish_card %}
-        {{ dish_card(dish) }}
-        """
-        html = render_template_string(template, dish=sample_dish)
+        html = _render(app, dish_card_template, dish=_base_dish)
 
         # アレルゲン警告が表示される（ja翻訳では"アレルゲン"が採用されている）
         assert "⚠️ アレルゲン:" in html
@@ -110,52 +134,47 @@ def test_dish_card_renders_allergens(app: Flask, sample_dish: Dish) -> None:
         assert "ナッツ" in html
 
 
-def test_dish_card_renders_without_allergens(app: Flask, sample_dish: Dish) -> None:
+def test_dish_card_renders_without_allergens(
+    app: Flask, dish_card_template: Template, sample_dish: Dish
+) -> None:
     """アレルギー情報がない場合、警告が表示されないことを確認"""
     sample_dish.allergens = []
 
-    with app.test_request_context():
-        template = """
-        {% from 'components/dish_card.html' import dish_card %}
-        {{ dish_card(dish) }}
-        """
-        html = render_template_string(template, dish=sample_dish)
+    html = _render(app, dish_card_template, dish=sample_dish)
 
-        # アレルギー警告が表示されない
-        assert "⚠️ アレルギー:" not in html
+    # アレルギー警告が表示されない
+    assert "⚠️ アレルギー:" not in html
 
 
-def test_dish_card_renders_category(app: Flask, sample_dish: Dish) -> None:
+def test_dish_card_renders_category(
+    app: Flask, dish_card_template: Template, _base_dish: Dish
+) -> None:
     """カテゴリバッジが表示されることを確認"""
-    with app.test_request_context():
-        template = """
-        {% from 'components/dish_card.html' import dish_card %}
-        {{ dish_card(dish) }}
-        """
-        html = render_template_string(template, dish=sample_dish)
+    html = _render(app, dish_card_template, dish=_base_dish)
 
-        # カテゴリが表示される
-        assert "main" in html
+    # カテゴリが表示される
+    assert "main" in html
 
 
-def test_dish_card_has_correct_css_classes(app: Flask, sample_dish: Dish) -> None:
+def test_dish_card_has_correct_css_classes(
+    app: Flask, dish_card_template: Template, _base_dish: Dish
+) -> None:
     """正しいCSSクラスが適用されていることを確認"""
-    with app.test_request_context():
-        template = """
-        {% from 'components/dish_card.html' import dish_card %}
-        {{ dish_card(dish) }}
-        """
-        html = render_template_string(template, dish=sample_dish)
-
-        # 主要なCSSクラスが含まれる（ライトモード）
-        assert "dish-card" in html
-        assert "bg-white" in html
-        assert "rounded-xl" in html
-        assert "shadow-sm" in html
-        assert "hover:shadow-md" in html
-        assert "transition-shadow" in html
-        assert "border-slate-200" in html
-        assert "hover:border-primary" in html
+    html = _render(app, dish_card_template, dish=_base_dish)
+
+    # 主要なCSSクラスが含まれる（ライトモード）
+    expected = [
+        "dish-card",
+        "bg-white",
+        "rounded-xl",
+        "shadow-sm",
+        "hover:shadow-md",
+        "transition-shadow",
+        "border-slate-200",
+        "hover:border-primary",
+    ]
+    counts = _class_counts(html, expected)
+    assert [c for c in expected if not counts[c]] == []
 
 
 def test_dish_list_uses_dish_number_over_loop_index(app: Flask) -> None:
@@ -173,18 +192,17 @@ def test_dish_list_uses_dish_number_over_loop_index(app: Flask) -> None:
         for n in [5, 3]
     ]
 
-    with app.test_request_context():
-        html = render_template(
-            "partials/dish_list.html",
-            dishes=dishes,
-            provider="claude",
-            processing_time=0.1,
-        )
+    html = render_template(
+        "partials/dish_list.html",
+        dishes=dishes,
+        provider="claude",
+        processing_time=0.1,
+    )
 
-        # loop.index なら 1, 2 になるところ、dish.number を使うので 5, 3 が現れる
-        # 番号バッジはタグ間に数字のみ（前後空白許容）で出現する
-        assert re.search(r">\s*5\s*<", html)
-        assert re.search(r">\s*3\s*<", html)
+    # loop.index なら 1, 2 になるところ、dish.number を使うので 5, 3 が現れる
+    # 番号バッジはタグ間に数字のみ（前後空白許容）で出現する
+    assert re.search(r">\s*5\s*<", html)
+    assert re.search(r">\s*3\s*<", html)
 
 
 def test_dish_list_falls_back_to_loop_index_when_number_missing(app: Flask) -> None:
@@ -200,14 +218,13 @@ def test_dish_list_falls_back_to_loop_index_when_number_missing(app: Flask) -> N
         for i in range(1, 3)
     ]
 
-    with app.test_request_context():
-        html = render_template(
-            "partials/dish_list.html",
-            dishes=dishes,
-            provider="claude",
-            processing_time=0.1,
-        )
+    html = render_template(
+        "partials/dish_list.html",
+        dishes=dishes,
+        provider="claude",
+        processing_time=0.1,
+    )
 
-        # loop.index で 1, 2 が振られる（番号バッジとして出現）
-        assert re.search(r">\s*1\s*<", html)
-        assert re.search(r">\s*2\s*<", html)
+    # loop.index で 1, 2 が振られる（番号バッジとして出現）
+    assert re.search(r">\s*1\s*<", html)
+    assert re.search(r">\s*2\s*<", html)
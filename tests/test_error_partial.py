@@ -1,157 +1,132 @@
 """error.html パーシャルテンプレートのテスト"""
 
-import pytest
-from flask import Flask, render_template_string
+from collections.abc import Iterator
+from typing import Any
 
-from app import create_app
+import pytest
+from flask import Flask
+from jinja2 import Template
 
 JA_PATH = "/?lang=ja"
 
+ERROR_TEMPLATE = "{% include 'partials/error.html' %}"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _request_context(app: Flask) -> Iterator[None]:
+    """モジュール内のテストで共有する日本語リクエストコンテキスト"""
+    with app.test_request_context(JA_PATH):
+        yield
+
+
+@pytest.fixture(scope="session")
+def error_template(app: Flask) -> Template:
+    """error.html を読み込むテンプレート（セッション内で一度だけコンパイル）"""
+    return app.jinja_env.from_string(ERROR_TEMPLATE)
+
 
-@pytest.fixture
-def app() -> Flask:
-    """テスト用のFlaskアプリケーション（t()などのJinja2グローバルを含む）"""
-    return create_app({"TESTING": True, "SECRET_KEY": "test-secret-key"})
+def _render(app: Flask, template: Template, **context: Any) -> str:
+    """コンパイル済みテンプレートを render_template_string と同じコンテキストで描画"""
+    app.update_template_context(context)
+    return template.render(context)
 
 
-def test_error_partial_renders_with_default_title(app: Flask) -> None:
+def test_error_partial_renders_with_default_title(app: Flask, error_template: Template) -> None:
     """デフォルトタイトルでレンダリングされることを確認"""
-    with app.test_request_context(JA_PATH):
-        template = """
-        {% include 'partials/error.html' %}
-        """
-        html = render_template_string(template, message="テストエラーメッセージ")
+    html = _render(app, error_template, message="テストエラーメッセージ")
 
-        assert "エラーが発生しました" in html
-        assert "テストエラーメッセージ" in html
+    assert "エラーが発生しました" in html
+    assert "テストエラーメッセージ" in html
 
 
-def test_error_partial_renders_with_custom_title(app: Flask) -> None:
+def test_error_partial_renders_with_custom_title(app: Flask, error_template: Template) -> None:
     """カスタムタイトルでレンダリングされることを確認"""
-    with app.test_request_context(JA_PATH):
-        template = """
-        {% include 'partials/error.html' %}
-        """
-        html = render_template_string(
-            template,
-            title="ファイルがありません",
-            message="画像ファイルを選択してください",
-        )
+    html = _render(
+        app,
+        error_template,
+        title="ファイルがありません",
+        message="画像ファイルを選択してください",
+    )
 
-        assert "ファイルがありません" in html
-        assert "画像ファイルを選択してください" in html
+    assert "ファイルがありません" in html
+    assert "画像ファイルを選択してください" in html
 
 
-def test_error_partial_renders_error_code(app: Flask) -> None:
+def test_error_partial_renders_error_code(app: Flask, error_template: Template) -> None:
     """エラーコードが表示されることを確認"""
-    with app.test_request_context(JA_PATH):
-        template = """
-        {% include 'partials/error.html' %}
-        """
-        html = render_template_string(
-            template,
-            title="解析に失敗しました",
-            message="しばらく待ってから再度お試しください",
-            code="API_ERROR",
-        )
+    html = _render(
+        app,
+        error_template,
+        title="解析に失敗しました",
+        message="しばらく待ってから再度お試しください",
+        code="API_ERROR",
+    )
 
-        assert "エラーコード: API_ERROR" in html
+    assert "エラーコード: API_ERROR" in html
 
 
-def test_error_partial_without_error_code(app: Flask) -> None:
+def test_error_partial_without_error_code(app: Flask, error_template: Template) -> None:
     """エラーコードがない場合は表示されないことを確認"""
-    with app.test_request_context(JA_PATH):
-        template = """
-        {% include 'partials/error.html' %}
-        """
-        html = render_template_string(
-            template,
-            title="エラー",
-            message="エラーが発生しました",
-        )
+    html = _render(
+        app,
+        error_template,
+        title="エラー",
+        message="エラーが発生しました",
+    )
 
-        assert "エラーコード:" not in html
+    assert "エラーコード:" not in html
 
 
-def test_error_partial_has_close_button(app: Flask) -> None:
+def test_error_partial_has_close_button(app: Flask, error_template: Template) -> None:
     """閉じるボタンが存在することを確認"""
-    with app.test_request_context(JA_PATH):
-        template = """
-        {% include 'partials/error.html' %}
-        """
-        html = render_template_string(template, message="テストエラー")
+    html = _render(app, error_template, message="テストエラー")
 
-        assert "閉じる" in html
-        assert "onclick" in html
-        assert "error-message" in html
+    assert "閉じる" in html
+    assert "onclick" in html
+    assert "error-message" in html
 
 
-def test_error_partial_has_error_icon(app: Flask) -> None:
+def test_error_partial_has_error_icon(app: Flask, error_template: Template) -> None:
     """エラーアイコンが表示されることを確認（SVG形式）"""
-    with app.test_request_context(JA_PATH):
-        template = """
-        {% include 'partials/error.html' %}
-        """
-        html = render_template_string(template, message="テストエラー")
+    html = _render(app, error_template, message="テストエラー")
 
-        # SVGエラーアイコンが表示される
-        assert "<svg" in html
-        assert 'role="alert"' in html
+    # SVGエラーアイコンが表示される
+    assert "<svg" in html
+    assert 'role="alert"' in html
 
 
-def test_error_partial_has_correct_css_classes(app: Flask) -> None:
+def test_error_partial_has_correct_css_classes(app: Flask, error_template: Template) -> None:
     """正しいCSSクラスが適用されていることを確認"""
-    with app.test_request_context(JA_PATH):
-        template = """
-        {% include 'partials/error.html' %}
-        """
-        html = render_template_string(template, message="テストエラー")
-
-        assert 'id="error-message"' in html
-        assert "bg-red-50" in html
-        assert "border-red-200" in html
-        assert "rounded-xl" in html
-        assert "animate-shake" in html
-        assert "text-red-700" in html
-
-
-def test_error_partial_renders_all_error_types(app: Flask) -> None:
+    html = _render(app, error_template, message="テストエラー")
+
+    expected = (
+        'id="error-message"',
+        "bg-red-50",
+        "border-red-200",
+        "rounded-xl",
+        "animate-shake",
+        "text-red-700",
+    )
+    missing = [c for c in expected if c not in html]
+    assert not missing, missing
+
+
+@pytest.mark.parametrize(
+    "title,message,code",
+    [
+        ("ファイルがありません", "画像ファイルを選択してください", "NO_FILE"),
+        ("非対応の形式です", "JPEG, PNG, WebP形式の画像を使用してください", "INVALID_FORMAT"),
+        ("ファイルが大きすぎます", "10MB以下の画像を使用してください", "FILE_TOO_LARGE"),
+        ("解析に失敗しました", "しばらく待ってから再度お試しください", "API_ERROR"),
+        ("料理が見つかりません", "メニュー画像を使用してください", "NO_DISHES"),
+    ],
+)
+def test_error_partial_renders_all_error_types(
+    app: Flask, error_template: Template, title: str, message: str, code: str
+) -> None:
     """様々なエラータイプが正しくレンダリングされることを確認"""
-    error_types = [
-        {
-            "title": "ファイルがありません",
-            "message": "画像ファイルを選択してください",
-            "code": "NO_FILE",
-        },
-        {
-            "title": "非対応の形式です",
-            "message": "JPEG, PNG, WebP形式の画像を使用してください",
-            "code": "INVALID_FORMAT",
-        },
-        {
-            "title": "ファイルが大きすぎます",
-            "message": "10MB以下の画像を使用してください",
-            "code": "FILE_TOO_LARGE",
-        },
-        {
-            "title": "解析に失敗しました",
-            "message": "しばらく待ってから再度お試しください",
-            "code": "API_ERROR",
-        },
-        {
-            "title": "料理が見つかりません",
-            "message": "メニュー画像を使用してください",
-            "code": "NO_DISHES",
-        },
-    ]
+    html = _render(app, error_template, title=title, message=message, code=code)
 
-    with app.test_request_context(JA_PATH):
-        template = """
-        {% include 'partials/error.html' %}
-        """
-        for error in error_types:
-            html = render_template_string(template, **error)
-
-            assert error["title"] in html
-            assert error["message"] in html
-            assert f"エラーコード: {error['code']}" in html
+    assert title in html
+    assert message in html
+    assert f"エラーコード: {code}" in html
@@ -0,0 +1,60 @@
+"""Tests for header-only image format detection."""
+
+from __future__ import annotations
+
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.services.image_header import ImageHeader, sniff_image
+
+
+def _encode(fmt: str, size: tuple[int, int] = (123, 45), **kwargs) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", size, color="red").save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+class TestSniffImage:
+    @pytest.mark.parametrize(
+        ("fmt", "kwargs", "mime_type"),
+        [
+            ("PNG", {}, "image/png"),
+            ("JPEG", {}, "image/jpeg"),
+            ("JPEG", {"progressive": True}, "image/jpeg"),
+            ("WEBP", {}, "image/webp"),
+            ("WEBP", {"lossless": True}, "image/webp"),
+        ],
+    )
+    def test_reads_format_and_dimensions(self, fmt, kwargs, mime_type):
+        assert sniff_image(_encode(fmt, **kwargs)) == ImageHeader(mime_type, 123, 45)
+
+    def test_extended_webp(self):
+        data = _encode("WEBP", exif=b"Exif\x00\x00MM")
+        assert sniff_image(data) == ImageHeader("image/webp", 123, 45)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"",
+            b"not a valid image",
+            b"RIFF\x24\x00\x00\x00WAVEfmt ",
+            b"\x89PNG",
+            b"\x89PNG\r\n\x1a\n\x00\x00",
+            b"\xff\xd8\xff\xe0\x00\x10JFIF",
+            b"RIFF\x24\x00\x00\x00WEBPVP8 ",
+        ],
+    )
+    def test_unknown_or_truncated_headers_are_rejected(self, data):
+        assert sniff_image(data) is None
+
+    def test_truncated_jpeg_before_frame_header_is_rejected(self):
+        data = _encode("JPEG")
+        sof = data.index(b"\xff\xc0")
+        assert sniff_image(data[:sof]) is None
+
+    def test_zero_dimension_png_is_rejected(self):
+        data = bytearray(_encode("PNG"))
+        data[16:20] = b"\x00\x00\x00\x00"
+        assert sniff_image(bytes(data)) is None
@@ -0,0 +1,86 @@
+"""Tests for downscaling uploads before they are sent to a provider."""
+
+from __future__ import annotations
+
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+import app.services.image_resize as image_resize
+from app.services.image_header import sniff_image
+from app.services.image_resize import downscale_image
+
+# Claude's input limit; the function itself takes the edge from the caller
+MAX_IMAGE_EDGE = 1568
+
+
+def _encode(
+    fmt: str, size: tuple[int, int], mode: str = "RGB", color: str | tuple = "red"
+) -> bytes:
+    buffer = BytesIO()
+    Image.new(mode, size, color=color).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+class TestDownscaleImage:
+    def test_small_image_is_returned_unchanged(self):
+        data = _encode("PNG", (100, 50))
+        assert downscale_image(data, "image/png", MAX_IMAGE_EDGE) == (data, "image/png")
+
+    def test_image_at_limit_is_returned_unchanged(self):
+        data = _encode("JPEG", (MAX_IMAGE_EDGE, 10))
+        assert downscale_image(data, "image/jpeg", MAX_IMAGE_EDGE) == (data, "image/jpeg")
+
+    @pytest.mark.parametrize(
+        ("fmt", "mode", "mime_type"),
+        [
+            ("JPEG", "RGB", "image/jpeg"),
+            ("PNG", "RGBA", "image/png"),
+            ("WEBP", "RGB", "image/webp"),
+        ],
+    )
+    def test_large_image_is_shrunk_to_jpeg(self, fmt, mode, mime_type):
+        data = _encode(fmt, (4000, 3000), mode)
+        resized, resized_mime = downscale_image(data, mime_type, MAX_IMAGE_EDGE)
+        header = sniff_image(resized)
+        assert resized_mime == "image/jpeg"
+        assert header is not None
+        assert (header.mime_type, header.width, header.height) == ("image/jpeg", 1568, 1176)
+
+    def test_image_over_pixel_cap_is_not_decoded(self, monkeypatch):
+        data = _encode("PNG", (4000, 3000))
+        monkeypatch.setattr(image_resize, "MAX_DECODE_PIXELS", 4000 * 3000 - 1)
+
+        def fail_open(*args, **kwargs):
+            raise AssertionError("image over the pixel cap was decoded")
+
+        monkeypatch.setattr(Image, "open", fail_open)
+        assert downscale_image(data, "image/png", MAX_IMAGE_EDGE) == (data, "image/png")
+
+    def test_undecodable_image_is_returned_unchanged(self):
+        data = _encode("PNG", (4000, 10))[:100]
+        assert downscale_image(data, "image/png", MAX_IMAGE_EDGE) == (data, "image/png")
+
+    def test_exif_orientation_is_applied(self):
+        # Stored 4000x3000 but displayed rotated 90 degrees (orientation 6)
+        img = Image.new("RGB", (4000, 3000), color="red")
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        buffer = BytesIO()
+        img.save(buffer, format="JPEG", exif=exif)
+
+        resized, _ = downscale_image(buffer.getvalue(), "image/jpeg", MAX_IMAGE_EDGE)
+
+        header = sniff_image(resized)
+        assert header is not None
+        assert (header.width, header.height) == (1176, 1568)
+
+    def test_transparency_is_flattened_onto_white(self):
+        data = _encode("PNG", (4000, 3000), mode="RGBA", color=(0, 0, 0, 0))
+
+        resized, _ = downscale_image(data, "image/png", MAX_IMAGE_EDGE)
+
+        with Image.open(BytesIO(resized)) as img:
+            r, g, b = img.getpixel((10, 10))
+        assert min(r, g, b) >= 250
@@ -3,27 +3,25 @@
 from io import BytesIO
 from unittest.mock import patch
 
+from app.services.ai.base import AnalysisResult
+from app.services.ai.factory import AIProviderFactory
+
 
 class TestMenuAnalysisFlow:
     """メニュー解析の一連のフローをテスト"""
 
-    def test_full_analysis_flow_json(self, client, real_menu_image, mock_analysis_result):
+    def test_full_analysis_flow_json(self, client, real_menu_image, mock_ai_factory):
         """JSON応答での完全フロー"""
         # 1. トップページにアクセス
         response = client.get("/")
         assert response.status_code == 200
 
         # 2. 画像をアップロードして解析
-        # ファクトリーからモックプロバイダーを返すようにパッチ
-        with patch("app.services.ai.factory.AIProviderFactory.create") as mock_factory:
-            mock_provider = mock_factory.return_value
-            mock_provider.analyze_menu.return_value = mock_analysis_result
-
-            response = client.post(
-                "/api/analyze",
-                data={"image": (BytesIO(real_menu_image), "menu.jpg")},
-                content_type="multipart/form-data",
-            )
+        response = client.post(
+            "/api/analyze",
+            data={"image": (BytesIO(real_menu_image), "menu.jpg")},
+            content_type="multipart/form-data",
+        )
 
         # 3. 結果を検証
         assert response.status_code == 200
@@ -32,41 +30,31 @@ class TestMenuAnalysisFlow:
         assert len(data["dishes"]) > 0
         assert "processing_time" in data
 
-    def test_full_analysis_flow_htmx(self, client, real_menu_image, mock_analysis_result):
+    def test_full_analysis_flow_htmx(self, client, real_menu_image, mock_ai_factory):
         """HTMX応答での完全フロー"""
-        # ファクトリーからモックプロバイダーを返すようにパッチ
-        with patch("app.services.ai.factory.AIProviderFactory.create") as mock_factory:
-            mock_provider = mock_factory.return_value
-            mock_provider.analyze_menu.return_value = mock_analysis_result
-
-            response = client.post(
-                "/api/analyze",
-                data={"image": (BytesIO(real_menu_image), "menu.jpg")},
-                headers={"HX-Request": "true"},
-                content_type="multipart/form-data",
-            )
+        response = client.post(
+            "/api/analyze",
+            data={"image": (BytesIO(real_menu_image), "menu.jpg")},
+            headers={"HX-Request": "true"},
+            content_type="multipart/form-data",
+        )
 
         assert response.status_code == 200
         assert b"dish-card" in response.data
         # Note: '解析結果' may not appear in the HTML, so we check for the card presence instead
 
-    def test_error_recovery(self, client, real_menu_image, mock_analysis_result):
+    def test_error_recovery(self, client, real_menu_image, mock_ai_factory):
         """エラーからの復旧テスト"""
         # 1. エラーを発生させる（画像なしでリクエスト）
         response = client.post("/api/analyze")
         assert response.status_code == 400
 
         # 2. 正しい画像で再試行
-        # ファクトリーからモックプロバイダーを返すようにパッチ
-        with patch("app.services.ai.factory.AIProviderFactory.create") as mock_factory:
-            mock_provider = mock_factory.return_value
-            mock_provider.analyze_menu.return_value = mock_analysis_result
-
-            response = client.post(
-                "/api/analyze",
-                data={"image": (BytesIO(real_menu_image), "menu.jpg")},
-                content_type="multipart/form-data",
-            )
+        response = client.post(
+            "/api/analyze",
+            data={"image": (BytesIO(real_menu_image), "menu.jpg")},
+            content_type="multipart/form-data",
+        )
 
         assert response.status_code == 200
 
@@ -76,8 +64,6 @@ class TestMultipleProviders:
 
     def test_claude_provider_selection(self, client):
         """Claudeプロバイダーが選択される"""
-        from app.services.ai.factory import AIProviderFactory
-
         provider = AIProviderFactory.create(api_key="sk-ant-test", provider_name="claude")
         assert provider.name == "claude"
 
@@ -95,8 +81,6 @@ class TestMultipleProviders:
 
     def test_provider_header_is_used(self, client, real_menu_image):
         """X-AI-Providerヘッダーがバックエンドで使用される"""
-        from app.services.ai.base import AnalysisResult
-
         with patch("app.services.ai.factory.AIProviderFactory.create") as mock_factory:
             mock_provider = mock_factory.return_value
             mock_provider.analyze_menu.return_value = AnalysisResult(
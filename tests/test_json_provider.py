@@ -0,0 +1,45 @@
+"""Tests for the orjson-backed Flask JSON provider."""
+
+from flask import jsonify
+
+from app.json_provider import ORJSONProvider
+from app.models.dish import BoundingBox, Category, Dish
+
+
+def _dish() -> Dish:
+    return Dish(
+        original_name="Pad Thai",
+        translated_name="パッタイ",
+        description="タイ風焼きそば",
+        spiciness=2,
+        sweetness=3,
+        ingredients=["米麺"],
+        allergens=["卵"],
+        category=Category.MAIN,
+        number=1,
+        bounding_box=BoundingBox(x=0.1, y=0.2, width=0.3, height=0.1),
+    )
+
+
+class TestORJSONProvider:
+    def test_app_uses_orjson_provider(self, app):
+        assert isinstance(app.json, ORJSONProvider)
+
+    def test_dish_serializes_like_to_dict(self, app):
+        dish = _dish()
+        assert app.json.loads(app.json.dumps(dish)) == dish.to_dict()
+
+    def test_jsonify_response(self, app):
+        with app.test_request_context():
+            response = jsonify({"dishes": [_dish()]})
+        assert response.mimetype == "application/json"
+        assert response.get_json()["dishes"][0]["category"] == "main"
+
+    def test_loads_accepts_bytes(self, app):
+        assert app.json.loads(b'{"a": 1}') == {"a": 1}
+
+    def test_wire_format_keeps_key_order_and_raw_utf8(self, app):
+        # Deliberately unlike Flask's default provider (sort_keys, ensure_ascii)
+        with app.test_request_context():
+            response = jsonify({"translated_name": "パッタイ", "category": Category.MAIN})
+        assert response.data == '{"translated_name":"パッタイ","category":"main"}'.encode()
@@ -0,0 +1,58 @@
+"""Tests for the queue-based application logging setup."""
+
+import logging
+
+import pytest
+
+import app.logging_setup as logging_setup
+
+
+@pytest.fixture
+def fresh_logging(monkeypatch):
+    """Run configure_logging from a clean state and undo it afterwards."""
+    monkeypatch.setattr(logging_setup, "_listener", None)
+    app_logger = logging.getLogger("app")
+    handlers, level = list(app_logger.handlers), app_logger.level
+    yield
+    if logging_setup._listener is not None:
+        logging_setup._listener.stop()
+    app_logger.handlers[:] = handlers
+    app_logger.setLevel(level)
+
+
+def test_records_are_written_by_listener(fresh_logging, capsys):
+    logging_setup.configure_logging()
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logging.getLogger("app.routes.menu").exception("Unexpected error: %s", "detail")
+    logging_setup._listener.stop()
+
+    err = capsys.readouterr().err
+    assert "ERROR app.routes.menu: Unexpected error: detail" in err
+    assert "RuntimeError: boom" in err
+
+
+def test_configure_logging_is_idempotent(fresh_logging):
+    logging_setup.configure_logging()
+    handler_count = len(logging.getLogger("app").handlers)
+    logging_setup.configure_logging()
+    assert len(logging.getLogger("app").handlers) == handler_count
+
+
+def test_handler_does_not_format_in_caller(fresh_logging):
+    logging_setup.configure_logging()
+    handler = logging.getLogger("app").handlers[-1]
+    record = logging.LogRecord("app", logging.ERROR, __file__, 1, "msg %s", ("x",), None)
+    assert handler.prepare(record) is record
+    assert record.msg == "msg %s"
+
+
+def test_create_app_leaves_logging_alone(fresh_logging):
+    from app import create_app
+
+    app_logger = logging.getLogger("app")
+    handlers = list(app_logger.handlers)
+    create_app({"TESTING": False})
+    assert app_logger.handlers == handlers
+    assert logging_setup._listener is None
@@ -1,12 +1,26 @@
 """Tests for menu analysis route handlers."""
 
+import functools
 from io import BytesIO
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
+import orjson
+import pytest
 from PIL import Image
 
+from app import create_app
 from app.models.dish import Category, Dish
 from app.services.ai.base import AIProviderError, AnalysisResult, InvalidMenuImageError
+from app.services.ai.factory import AIProviderFactory
+
+
+@functools.cache
+def _encode_test_image(format, size, color):
+    """フォーマット・サイズ・色ごとに一度だけエンコードした画像バイト列を返す."""
+    img = Image.new("RGB", size, color)
+    img_bytes = BytesIO()
+    img.save(img_bytes, format=format)
+    return img_bytes.getvalue()
 
 
 def create_test_image(format="PNG", size=(100, 100), color="red"):
@@ -19,13 +33,14 @@ def create_test_image(format="PNG", size=(100, 100), color="red"):
         color: 画像の色
 
     Returns:
-        画像データのバイト列
+        画像データのバイト列（呼び出しごとに新しい BytesIO）
     """
-    img = Image.new("RGB", size, color)
-    img_bytes = BytesIO()
-    img.save(img_bytes, format=format)
-    img_bytes.seek(0)
-    return img_bytes
+    return BytesIO(_encode_test_image(format, size, color))
+
+
+def _json(response):
+    """レスポンス本文を orjson でデコードする（アプリ側のシリアライザと同じ実装）."""
+    return orjson.loads(response.data)
 
 
 def create_mock_result():
@@ -52,40 +67,67 @@ def create_mock_result():
     )
 
 
+# 各テストは結果を読むだけなので、モジュール読み込み時に一度だけ生成して共有する
+_MOCK_RESULT = create_mock_result()
+
+
+class _FakeProvider:
+    """analyze_menu で固定の結果を返すだけのプロバイダー（Mock より軽量）."""
+
+    name = "mock"
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def analyze_menu(self, *args):
+        self.calls.append(args)
+        return self.result
+
+
 class TestAnalyzeMenuEndpoint:
     """メニュー解析エンドポイントのテスト."""
 
+    @pytest.fixture(autouse=True)
+    def _patch_factory(self, monkeypatch):
+        """AIProviderFactory.create が self.provider を返すようにする（テストごとに差し替え可）."""
+        self.provider = _FakeProvider(_MOCK_RESULT)
+        monkeypatch.setattr(AIProviderFactory, "create", lambda *args, **kwargs: self.provider)
+
     def test_no_file_provided(self, client):
         """ファイルが送信されない場合、エラーを返す."""
         response = client.post("/api/analyze")
 
         assert response.status_code == 400
-        assert response.json["success"] is False
-        assert response.json["code"] == "NO_FILE"
-        assert "No image file provided" in response.json["error"]
+        data = _json(response)
+        assert data["success"] is False
+        assert data["code"] == "NO_FILE"
+        assert "No image file provided" in data["error"]
 
     def test_empty_filename(self, client):
         """ファイル名が空の場合、エラーを返す."""
         response = client.post("/api/analyze", data={"image": (BytesIO(b""), "")})
 
         assert response.status_code == 400
-        assert response.json["success"] is False
-        assert response.json["code"] == "NO_FILE"
-        assert "No file selected" in response.json["error"]
+        data = _json(response)
+        assert data["success"] is False
+        assert data["code"] == "NO_FILE"
+        assert "No file selected" in data["error"]
 
     def test_invalid_file_extension(self, client):
         """無効な拡張子の場合、エラーを返す."""
         response = client.post("/api/analyze", data={"image": (BytesIO(b"test"), "test.txt")})
 
         assert response.status_code == 400
-        assert response.json["success"] is False
-        assert response.json["code"] == "INVALID_FILE"
-        assert "File type not allowed" in response.json["error"]
+        data = _json(response)
+        assert data["success"] is False
+        assert data["code"] == "INVALID_FILE"
+        assert "File type not allowed" in data["error"]
 
-    def test_file_too_large(self, client):
+    def test_file_too_large(self, client, small_upload_limit):
         """ファイルサイズが大きすぎる場合、エラーを返す."""
-        # 11MBのデータを生成
-        large_data = b"0" * (11 * 1024 * 1024)
+        # 上限を 1 バイト超えるデータを生成
+        large_data = bytes(small_upload_limit + 1)
         img_bytes = BytesIO(large_data)
 
         response = client.post("/api/analyze", data={"image": (img_bytes, "test.png")})
@@ -100,9 +142,10 @@ class TestAnalyzeMenuEndpoint:
         response = client.post("/api/analyze", data={"image": (img_bytes, "test.png")})
 
         assert response.status_code == 400
-        assert response.json["success"] is False
-        assert response.json["code"] == "INVALID_FILE"
-        assert "File is empty" in response.json["error"]
+        data = _json(response)
+        assert data["success"] is False
+        assert data["code"] == "INVALID_FILE"
+        assert "File is empty" in data["error"]
 
     def test_invalid_image_data(self, client):
         """無効な画像データの場合、エラーを返す."""
@@ -111,84 +154,47 @@ class TestAnalyzeMenuEndpoint:
         response = client.post("/api/analyze", data={"image": (img_bytes, "test.png")})
 
         assert response.status_code == 400
-        assert response.json["success"] is False
-        assert response.json["code"] == "INVALID_FILE"
-        assert "Invalid image file" in response.json["error"]
-
-    @patch("app.routes.menu.AIProviderFactory.create")
-    def test_successful_analysis_png(self, mock_factory, client):
-        """PNG画像の解析が成功する."""
-        # モックの設定
-        mock_provider = Mock()
-        mock_provider.analyze_menu.return_value = create_mock_result()
-        mock_factory.return_value = mock_provider
-
-        # テスト画像を生成
-        img_bytes = create_test_image(format="PNG")
-
-        response = client.post(
-            "/api/analyze",
-            data={"image": (img_bytes, "test.png")},
-            content_type="multipart/form-data",
-        )
-
-        assert response.status_code == 200
-        assert response.json["success"] is True
-        assert len(response.json["dishes"]) == 1
-        assert response.json["dishes"][0]["original_name"] == "Pad Thai"
-        assert response.json["provider"] == "mock"
-        assert "processing_time" in response.json
-        assert mock_provider.analyze_menu.called
-
-    @patch("app.routes.menu.AIProviderFactory.create")
-    def test_successful_analysis_jpeg(self, mock_factory, client):
-        """JPEG画像の解析が成功する."""
-        # モックの設定
-        mock_provider = Mock()
-        mock_provider.analyze_menu.return_value = create_mock_result()
-        mock_factory.return_value = mock_provider
-
+        data = _json(response)
+        assert data["success"] is False
+        assert data["code"] == "INVALID_FILE"
+        assert "Invalid image file" in data["error"]
+
+    @pytest.mark.parametrize(("fmt", "ext"), [("PNG", "png"), ("JPEG", "jpg"), ("WEBP", "webp")])
+    def test_successful_analysis(self, client, fmt, ext):
+        """PNG / JPEG / WebP 画像の解析が成功する."""
         # テスト画像を生成
-        img_bytes = create_test_image(format="JPEG")
+        img_bytes = create_test_image(format=fmt)
 
         response = client.post(
             "/api/analyze",
-            data={"image": (img_bytes, "test.jpg")},
+            data={"image": (img_bytes, f"test.{ext}")},
             content_type="multipart/form-data",
         )
 
         assert response.status_code == 200
-        assert response.json["success"] is True
-        assert len(response.json["dishes"]) == 1
-
-    @patch("app.routes.menu.AIProviderFactory.create")
-    def test_successful_analysis_webp(self, mock_factory, client):
-        """WebP画像の解析が成功する."""
-        # モックの設定
-        mock_provider = Mock()
-        mock_provider.analyze_menu.return_value = create_mock_result()
-        mock_factory.return_value = mock_provider
-
-        # テスト画像を生成
-        img_bytes = create_test_image(format="WEBP")
-
+        data = _json(response)
+        assert data["success"] is True
+        assert len(data["dishes"]) == 1
+        assert data["dishes"][0]["original_name"] == "Pad Thai"
+        assert data["provider"] == "mock"
+        assert "processing_time" in data
+        assert self.provider.calls
+
+    def test_success_body_is_serialized_by_orjson(self, client):
+        """成功レスポンスは orjson で Dish を直接シリアライズする（キー順・区切りがそのまま）."""
         response = client.post(
             "/api/analyze",
-            data={"image": (img_bytes, "test.webp")},
+            data={"image": (create_test_image(), "test.png")},
             content_type="multipart/form-data",
         )
 
-        assert response.status_code == 200
-        assert response.json["success"] is True
-        assert len(response.json["dishes"]) == 1
+        assert response.data.startswith(b'{"success":true,"dishes":[{"original_name":"Pad Thai"')
 
-    @patch("app.routes.menu.AIProviderFactory.create")
-    def test_ai_provider_error(self, mock_factory, client):
+    def test_ai_provider_error(self, client):
         """AIプロバイダーエラーの場合、エラーを返す."""
         # モックの設定
-        mock_provider = Mock()
-        mock_provider.analyze_menu.side_effect = AIProviderError("API error")
-        mock_factory.return_value = mock_provider
+        self.provider = Mock()
+        self.provider.analyze_menu.side_effect = AIProviderError("API error")
 
         # テスト画像を生成
         img_bytes = create_test_image(format="PNG")
@@ -200,17 +206,16 @@ class TestAnalyzeMenuEndpoint:
         )
 
         assert response.status_code == 500
-        assert response.json["success"] is False
-        assert response.json["code"] == "AI_ERROR"
-        assert "Analysis failed" in response.json["error"]
+        data = _json(response)
+        assert data["success"] is False
+        assert data["code"] == "AI_ERROR"
+        assert "Analysis failed" in data["error"]
 
-    @patch("app.routes.menu.AIProviderFactory.create")
-    def test_unexpected_error(self, mock_factory, client):
+    def test_unexpected_error(self, client):
         """予期しないエラーの場合、エラーを返す."""
         # モックの設定
-        mock_provider = Mock()
-        mock_provider.analyze_menu.side_effect = Exception("Unexpected error")
-        mock_factory.return_value = mock_provider
+        self.provider = Mock()
+        self.provider.analyze_menu.side_effect = Exception("Unexpected error")
 
         # テスト画像を生成
         img_bytes = create_test_image(format="PNG")
@@ -222,9 +227,10 @@ class TestAnalyzeMenuEndpoint:
         )
 
         assert response.status_code == 500
-        assert response.json["success"] is False
-        assert response.json["code"] == "INTERNAL_ERROR"
-        assert "Server error occurred" in response.json["error"]
+        data = _json(response)
+        assert data["success"] is False
+        assert data["code"] == "INTERNAL_ERROR"
+        assert "Server error occurred" in data["error"]
 
     def test_invalid_mime_type_with_valid_extension(self, client):
         """有効な拡張子でも無効なMIMEタイプの場合、エラーを返す."""
@@ -235,18 +241,13 @@ class TestAnalyzeMenuEndpoint:
         )
 
         assert response.status_code == 400
-        assert response.json["success"] is False
-        assert response.json["code"] == "INVALID_FILE"
-        assert "Invalid MIME type" in response.json["error"]
+        data = _json(response)
+        assert data["success"] is False
+        assert data["code"] == "INVALID_FILE"
+        assert "Invalid MIME type" in data["error"]
 
-    @patch("app.routes.menu.AIProviderFactory.create")
-    def test_htmx_request_returns_html_partial(self, mock_factory, client):
+    def test_htmx_request_returns_html_partial(self, client):
         """HTMXリクエストの場合、HTMLパーシャルを返す."""
-        # モックの設定
-        mock_provider = Mock()
-        mock_provider.analyze_menu.return_value = create_mock_result()
-        mock_factory.return_value = mock_provider
-
         # テスト画像を生成
         img_bytes = create_test_image(format="PNG")
 
@@ -264,16 +265,10 @@ class TestAnalyzeMenuEndpoint:
         assert b"Pad Thai" in response.data
         assert b"\xe3\x83\x91\xe3\x83\x83\xe3\x82\xbf\xe3\x82\xa4" in response.data  # パッタイ
         assert b"mock" in response.data  # provider
-        assert mock_provider.analyze_menu.called
+        assert self.provider.calls
 
-    @patch("app.routes.menu.AIProviderFactory.create")
-    def test_non_htmx_request_returns_json(self, mock_factory, client):
+    def test_non_htmx_request_returns_json(self, client):
         """非HTMXリクエストの場合、JSONを返す（後方互換性）."""
-        # モックの設定
-        mock_provider = Mock()
-        mock_provider.analyze_menu.return_value = create_mock_result()
-        mock_factory.return_value = mock_provider
-
         # テスト画像を生成
         img_bytes = create_test_image(format="PNG")
 
@@ -286,20 +281,19 @@ class TestAnalyzeMenuEndpoint:
 
         assert response.status_code == 200
         assert response.content_type == "application/json"
-        assert response.json["success"] is True
-        assert len(response.json["dishes"]) == 1
-        assert response.json["dishes"][0]["original_name"] == "Pad Thai"
-        assert response.json["provider"] == "mock"
+        data = _json(response)
+        assert data["success"] is True
+        assert len(data["dishes"]) == 1
+        assert data["dishes"][0]["original_name"] == "Pad Thai"
+        assert data["provider"] == "mock"
 
-    @patch("app.routes.menu.AIProviderFactory.create")
-    def test_htmx_request_with_empty_dishes(self, mock_factory, client):
+    def test_htmx_request_with_empty_dishes(self, client):
         """HTMXリクエストで料理が検出されない場合、エラーHTMLを返す."""
         # モックの設定（InvalidMenuImageErrorを発生させる）
-        mock_provider = Mock()
-        mock_provider.analyze_menu.side_effect = InvalidMenuImageError(
+        self.provider = Mock()
+        self.provider.analyze_menu.side_effect = InvalidMenuImageError(
             "画像からメニューを検出できませんでした。メニュー表の写真であることを確認してください。"
         )
-        mock_factory.return_value = mock_provider
 
         # テスト画像を生成
         img_bytes = create_test_image(format="PNG")
@@ -316,3 +310,93 @@ class TestAnalyzeMenuEndpoint:
         assert response.content_type.startswith("text/html")
         assert b"INVALID_MENU_IMAGE" in response.headers.get("X-Error-Code", "").encode()
         assert "画像からメニューを検出できませんでした".encode() in response.data
+
+    def test_columnar_query_returns_one_list_per_field(self, client):
+        """columnar=trueの場合、料理をフィールドごとのリストで返す."""
+        response = client.post(
+            "/api/analyze?columnar=true",
+            data={"image": (create_test_image(format="PNG"), "test.png")},
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 200
+        dishes = _json(response)["dishes"]
+        assert dishes["original_name"] == ["Pad Thai"]
+        assert dishes["category"] == ["main"]
+        assert dishes["bounding_box"] == [None]
+        assert set(dishes) == set(_MOCK_RESULT.dishes[0].to_dict())
+
+
+class TestAnalysisCache:
+    """同一画像の再解析キャッシュのテスト."""
+
+    @pytest.fixture(autouse=True)
+    def _patch_factory(self, monkeypatch):
+        """AIProviderFactory.create が self.provider を返し、渡された API キーを記録する."""
+        self.provider = _FakeProvider(_MOCK_RESULT)
+        self.api_keys = []
+
+        def create(*args, **kwargs):
+            self.api_keys.append(kwargs["api_key"])
+            return self.provider
+
+        monkeypatch.setattr(AIProviderFactory, "create", create)
+
+    @staticmethod
+    def _post(client, image_bytes, language="en", api_key="sk-ant-test"):
+        return client.post(
+            "/api/analyze",
+            data={"image": (BytesIO(image_bytes), "test.png")},
+            headers={"X-Language": language, "X-API-Key": api_key},
+            content_type="multipart/form-data",
+        )
+
+    def test_same_image_is_analyzed_once(self, client):
+        """同じ画像・言語の2回目はプロバイダーを呼ばずにキャッシュを返す."""
+        image_bytes = create_test_image().getvalue()
+
+        first = self._post(client, image_bytes)
+        second = self._post(client, image_bytes)
+
+        assert first.status_code == second.status_code == 200
+        assert _json(second)["dishes"] == _json(first)["dishes"]
+        assert len(self.provider.calls) == 1
+
+    def test_language_is_part_of_the_key(self, client):
+        """言語が異なれば再解析する."""
+        image_bytes = create_test_image().getvalue()
+
+        self._post(client, image_bytes, language="en")
+        self._post(client, image_bytes, language="ja")
+
+        assert len(self.provider.calls) == 2
+
+    def test_api_key_is_part_of_the_key(self, client):
+        """別の API キーでは他人のキーで得たキャッシュを返さず再解析する."""
+        image_bytes = create_test_image().getvalue()
+
+        assert self._post(client, image_bytes, api_key="sk-ant-owner").status_code == 200
+        assert self._post(client, image_bytes, api_key="totally-bogus").status_code == 200
+
+        assert len(self.provider.calls) == 2
+        assert self.api_keys == ["sk-ant-owner", "totally-bogus"]
+
+    def test_failures_are_not_cached(self, client):
+        """エラーになった解析はキャッシュしない."""
+        self.provider = Mock()
+        self.provider.analyze_menu.side_effect = [AIProviderError("boom"), _MOCK_RESULT]
+        image_bytes = create_test_image().getvalue()
+
+        assert self._post(client, image_bytes).status_code == 500
+        assert self._post(client, image_bytes).status_code == 200
+
+    def test_cache_can_be_disabled(self):
+        """ANALYSIS_CACHE_SIZE=0 でキャッシュを無効化できる."""
+        app = create_app({"TESTING": True, "ANALYSIS_CACHE_SIZE": 0})
+        client = app.test_client()
+        image_bytes = create_test_image().getvalue()
+
+        self._post(client, image_bytes)
+        self._post(client, image_bytes)
+
+        assert len(self.provider.calls) == 2
@@ -1,8 +1,38 @@
 """Edge-case coverage for app.routes.menu — uncovered branches."""
 
+from io import BytesIO
 from unittest.mock import MagicMock
 
-from app.routes.menu import MAX_FILE_SIZE, validate_image_file
+import pytest
+from werkzeug.datastructures import FileStorage
+
+import app.routes.menu as menu
+from app.routes.menu import allowed_file, validate_image_file
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("menu.png", True),
+        ("menu.JPEG", True),
+        ("archive.tar.webp", True),
+        (".png", True),
+        ("menu", False),
+        ("menu.", False),
+        ("menu.gif", False),
+        ("png", False),
+    ],
+)
+def test_allowed_file(filename, expected):
+    assert allowed_file(filename) is expected
+
+
+@pytest.fixture
+def small_file_limit(monkeypatch):
+    """Lower MAX_FILE_SIZE to 1KB so oversized uploads do not allocate 10MB."""
+    limit = 1024
+    monkeypatch.setattr(menu, "MAX_FILE_SIZE", limit)
+    return limit
 
 
 class TestValidateImageFile:
@@ -21,17 +51,32 @@ class TestValidateImageFile:
         assert ok is False
         assert error == "No filename provided"
 
-    def test_file_exceeds_max_size(self):
-        oversized = b"\x00" * (MAX_FILE_SIZE + 1)
-        file = MagicMock()
-        file.filename = "big.png"
-        file.content_type = "image/png"
-        file.read.return_value = oversized
+    def test_file_exceeds_max_size(self, small_file_limit):
+        oversized = bytes(small_file_limit + 1)
+        file = FileStorage(stream=BytesIO(oversized), filename="big.png", content_type="image/png")
         ok, error, data = validate_image_file(file)
         assert ok is False
         assert "exceeds limit" in error
         assert data is None
 
+    def test_oversized_file_is_rejected_without_reading(self, small_file_limit):
+        stream = BytesIO(bytes(small_file_limit + 1))
+        file = FileStorage(stream=stream, filename="big.png", content_type="image/png")
+        file.read = MagicMock(side_effect=AssertionError("oversized upload was read"))
+        ok, error, _ = validate_image_file(file)
+        assert ok is False
+        assert "exceeds limit" in error
+
+    def test_valid_file_is_read_once(self, sample_image):
+        payload, _ = sample_image
+        file = FileStorage(stream=BytesIO(payload), filename="menu.png", content_type="image/png")
+        file.read = MagicMock(wraps=file.read)
+        ok, error, data = validate_image_file(file)
+        assert ok is True
+        assert error is None
+        assert data == payload
+        file.read.assert_called_once_with()
+
 
 class TestAnalyzeMenuNoApiKey:
     """Use raw test_client (no auto X-API-Key injection) to hit the NO_API_KEY branch."""
@@ -40,8 +85,20 @@ class TestAnalyzeMenuNoApiKey:
         raw_client = app.test_client()
         response = raw_client.post("/api/analyze")
         assert response.status_code == 401
-        assert response.json["success"] is False
-        assert response.json["code"] == "NO_API_KEY"
+        data = response.get_json()
+        assert data["success"] is False
+        assert data["code"] == "NO_API_KEY"
+
+    def test_missing_api_key_rejected_before_body_is_parsed(self, app):
+        raw_client = app.test_client()
+        # A malformed body would be a 400 INVALID_FILE if it were parsed first
+        response = raw_client.post(
+            "/api/analyze",
+            data=b"garbage",
+            headers={"Content-Type": "multipart/form-data; boundary=xyz"},
+        )
+        assert response.status_code == 401
+        assert response.get_json()["code"] == "NO_API_KEY"
 
     def test_missing_api_key_htmx_returns_html(self, app):
         raw_client = app.test_client()
@@ -51,9 +108,55 @@ class TestAnalyzeMenuNoApiKey:
         assert response.headers.get("X-Error-Code") == "NO_API_KEY"
 
 
+class TestErrorPartialLanguage:
+    def test_htmx_error_follows_lang_query(self, app):
+        raw_client = app.test_client()
+        en = raw_client.post("/api/analyze", headers={"HX-Request": "true"})
+        ja = raw_client.post("/api/analyze?lang=ja", headers={"HX-Request": "true"})
+        assert en.data != ja.data
+
+
 class TestAnalyzeMenuInvalidLanguage:
     def test_invalid_language_falls_back_to_english(self, client):
         response = client.post("/api/analyze", headers={"X-Language": "fr"})
         # Reaches NO_FILE path — language fallback happened silently before
         assert response.status_code == 400
         assert response.json["code"] == "NO_FILE"
+
+
+class TestMultipartUpload:
+    @pytest.mark.parametrize(
+        "content_type",
+        ["multipart/form-data; boundary=xyz", "multipart/form-data"],
+    )
+    def test_malformed_multipart_body_returns_400(self, client, content_type):
+        response = client.post(
+            "/api/analyze", data=b"garbage", headers={"Content-Type": content_type}
+        )
+        assert response.status_code == 400
+        assert response.json["code"] == "INVALID_FILE"
+
+    def test_body_over_max_content_length_returns_413(self, client, small_upload_limit):
+        body = bytes(small_upload_limit + 1)
+        response = client.post(
+            "/api/analyze",
+            data=body,
+            headers={"Content-Type": "multipart/form-data; boundary=xyz"},
+        )
+        assert response.status_code == 413
+        data = response.get_json()
+        assert data["success"] is False
+        assert data["code"] == "INVALID_FILE"
+
+    def test_body_over_max_content_length_htmx_returns_html(self, client, small_upload_limit):
+        response = client.post(
+            "/api/analyze",
+            data=bytes(small_upload_limit + 1),
+            headers={
+                "Content-Type": "multipart/form-data; boundary=xyz",
+                "HX-Request": "true",
+            },
+        )
+        assert response.status_code == 413
+        assert response.content_type.startswith("text/html")
+        assert response.headers["X-Error-Code"] == "INVALID_FILE"
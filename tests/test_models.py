@@ -353,6 +353,11 @@ class TestBoundingBox:
         assert bbox.width == 0.3
         assert bbox.height == 0.4
 
+    def test_bounding_box_uses_slots(self):
+        """BoundingBox is a slots dataclass like Dish (no per-instance __dict__)."""
+        bbox = BoundingBox(x=0.1, y=0.2, width=0.3, height=0.4)
+        assert not hasattr(bbox, "__dict__")
+
     def test_bounding_box_boundary_values(self):
         """Test BoundingBox at boundary values (0 and 1)."""
         bbox = BoundingBox(x=0.0, y=0.0, width=1.0, height=1.0)
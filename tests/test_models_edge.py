@@ -2,7 +2,7 @@
 
 import pytest
 
-from app.models.dish import BoundingBox, Dish
+from app.models.dish import BoundingBox, Category, Dish
 
 
 class TestBoundingBoxTypeCheck:
@@ -36,3 +36,18 @@ class TestDishFromDictInvalidBoundingBox:
         data["bounding_box"] = {"x": 2.0, "y": 0.1, "width": 0.1, "height": 0.1}
         dish = Dish.from_dict(data)
         assert dish.bounding_box is None
+
+
+class TestDishFromDictNonStringCategory:
+    @pytest.mark.parametrize("raw_category", [None, 3, ["main"]])
+    def test_non_string_category_falls_back_to_other(self, raw_category):
+        data = {
+            "original_name": "Pad Thai",
+            "translated_name": "パッタイ",
+            "description": "タイ風焼きそば",
+            "spiciness": 2,
+            "sweetness": 3,
+            "category": raw_category,
+        }
+        dish = Dish.from_dict(data)
+        assert dish.category is Category.OTHER
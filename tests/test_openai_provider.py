@@ -7,11 +7,13 @@
 
 from __future__ import annotations
 
+import base64
 import json
-import os
+from io import BytesIO
 from unittest.mock import MagicMock, patch
 
 import pytest
+from PIL import Image
 
 from app.services.ai.base import APICallError, APIKeyMissingError
 from app.services.ai.factory import AIProviderFactory
@@ -60,9 +62,10 @@ class TestOpenAIProviderInit:
         with pytest.raises(APIKeyMissingError, match="API key is required"):
             OpenAIProvider(api_key="")
 
-    def test_name_is_openai(self):
-        with patch.dict(os.environ, {}, clear=True):
-            assert OpenAIProvider(api_key="sk-test").name == "openai"
+    def test_name_is_openai(self, monkeypatch):
+        for name in ("OPENAI_API_KEY", "OPENAI_BASE_URL", "OPENAI_ORG_ID", "OPENAI_PROJECT_ID"):
+            monkeypatch.delenv(name, raising=False)
+        assert OpenAIProvider(api_key="sk-test").name == "openai"
 
 
 class TestOpenAIProviderPrompt:
@@ -74,7 +77,8 @@ class TestOpenAIProviderPrompt:
 
 
 class TestOpenAIProviderAnalyzeMenu:
-    def test_rejects_oversized_image(self):
+    def test_rejects_oversized_image(self, monkeypatch):
+        monkeypatch.setattr(OpenAIProvider, "MAX_IMAGE_SIZE", 8)
         provider = OpenAIProvider(api_key="sk-test")
         big = b"x" * (provider.MAX_IMAGE_SIZE + 1)
         with pytest.raises(APICallError, match="exceeds maximum"):
@@ -105,6 +109,24 @@ class TestOpenAIProviderAnalyzeMenu:
         )
         assert image_block["image_url"]["url"].startswith("data:image/png;base64,")
 
+    @patch("app.services.ai.openai_provider.OpenAI")
+    def test_large_image_is_sent_at_full_size(self, mock_openai_class):
+        """OpenAI は 10M ピクセル超も受け付けるため、Claude 向けの縮小はかけない."""
+        client = _mock_openai(mock_openai_class, json.dumps(_dish_payload()))
+        buffer = BytesIO()
+        Image.new("RGB", (3000, 2000), color="red").save(buffer, format="PNG")
+        data = buffer.getvalue()
+
+        OpenAIProvider(api_key="sk-test").analyze_menu(data, "image/png")
+
+        kwargs = client.chat.completions.create.call_args.kwargs
+        image_block = next(
+            b for b in kwargs["messages"][0]["content"] if b["type"] == "image_url"
+        )
+        assert image_block["image_url"]["url"] == (
+            "data:image/png;base64," + base64.b64encode(data).decode("ascii")
+        )
+
     @patch("app.services.ai.openai_provider.OpenAI")
     def test_wraps_openai_api_error(self, mock_openai_class):
         from openai import APIError
@@ -39,6 +39,13 @@ class TestParseDishesHappyPath:
         assert len(parse_dishes(f"```json\n{body}\n```")) == 1
         assert len(parse_dishes(f"```\n{body}\n```")) == 1
 
+    def test_fences_with_surrounding_whitespace_and_inner_backticks(self):
+        dish = _dish("Tom Yum", 1)
+        dish["description"] = "served with ``` garnish"
+        body = json.dumps({"dishes": [dish]})
+        dishes = parse_dishes(f"  \n```json {body} ```\n\n")
+        assert dishes[0].description == "served with ``` garnish"
+
 
 class TestParseDishesErrors:
     def test_invalid_json_raises(self):
@@ -53,6 +60,10 @@ class TestParseDishesErrors:
         with pytest.raises(APICallError, match="'dishes' key"):
             parse_dishes(json.dumps(["not", "a", "dict"]))
 
+    def test_non_list_dishes_raises(self):
+        with pytest.raises(APICallError, match="'dishes' must be a list"):
+            parse_dishes(json.dumps({"dishes": None}))
+
     def test_all_dishes_invalid_raises_invalid_menu(self):
         with pytest.raises(InvalidMenuImageError, match="Could not detect menu"):
             parse_dishes(json.dumps({"dishes": []}))
@@ -64,6 +75,11 @@ class TestParseDishesResilience:
         dishes = parse_dishes(json.dumps(payload))
         assert [d.original_name for d in dishes] == ["Good"]
 
+    def test_skips_non_object_dishes(self):
+        payload = {"dishes": ["not a dish", None, _dish("Good", 1)]}
+        dishes = parse_dishes(json.dumps(payload))
+        assert [d.original_name for d in dishes] == ["Good"]
+
 
 class TestParseDishesNumbering:
     def test_sorts_by_number_when_sequential(self):
@@ -1,38 +1,19 @@
 """Tests for the application routes."""
 
 from io import BytesIO
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
-from PIL import Image
 
-from app.models.dish import Category, Dish
-from app.services.ai.base import AIProviderError, AnalysisResult
+from app import create_app
+from app.services.ai.base import AIProviderError
 
 
-def create_test_image(format="PNG", size=(100, 100), color="red"):
-    """
-    テスト用の画像を生成.
-
-    Args:
-        format: 画像フォーマット
-        size: 画像サイズ
-        color: 画像の色
-
-    Returns:
-        画像データのバイト列
-    """
-    img = Image.new("RGB", size, color)
-    img_bytes = BytesIO()
-    img.save(img_bytes, format=format)
-    img_bytes.seek(0)
-    return img_bytes.read()
-
-
-@pytest.fixture
-def sample_image():
-    """テスト用のサンプル画像を提供するフィクスチャ."""
-    return create_test_image()
+@pytest.fixture(scope="session")
+def sample_image(sample_image):
+    """conftest の 1x1 PNG（エンコード済みのバイト列リテラル）からバイト列だけを返す."""
+    image_data, _ = sample_image
+    return image_data
 
 
 class TestIndexRoute:
@@ -70,10 +51,23 @@ class TestHealthRoute:
 
         assert response.status_code == 405
 
+    def test_health_can_be_disabled(self):
+        """Test that ENABLE_HEALTH=False skips registering the health endpoint."""
+        app = create_app({"TESTING": True, "ENABLE_HEALTH": False})
+
+        assert "health" not in app.blueprints
+        assert app.test_client().get("/health").status_code == 404
+
 
 class TestAnalyzeRoute:
     """メニュー解析エンドポイントのテスト."""
 
+    @pytest.fixture
+    def mock_factory(self):
+        """AIProviderFactory.create をパッチしたモックを返す."""
+        with patch("app.services.ai.factory.AIProviderFactory.create") as mock_create:
+            yield mock_create
+
     def test_no_file_error(self, client):
         """ファイル未添付エラーテスト."""
         response = client.post("/api/analyze")
@@ -89,36 +83,17 @@ class TestAnalyzeRoute:
         assert response.status_code == 400
         assert response.get_json()["code"] == "INVALID_FILE"
 
-    def test_file_too_large_error(self, client):
+    def test_file_too_large_error(self, client, small_upload_limit):
         """ファイルサイズエラーテスト."""
-        large_file = BytesIO(b"x" * (11 * 1024 * 1024))  # 11MB
+        large_file = BytesIO(bytes(small_upload_limit + 1))
         data = {"image": (large_file, "test.jpg")}
         response = client.post("/api/analyze", data=data)
         # FlaskのMAX_CONTENT_LENGTHにより413が返される
         assert response.status_code == 413
 
-    @patch("app.routes.menu.AIProviderFactory.create")
-    def test_analyze_success(self, mock_factory, client, sample_image):
+    def test_analyze_success(self, mock_factory, client, sample_image, pad_thai_result):
         """正常系テスト."""
-        mock_provider = Mock()
-        mock_provider.analyze_menu.return_value = AnalysisResult(
-            dishes=[
-                Dish(
-                    original_name="Pad Thai",
-                    translated_name="パッタイ",
-                    description="米麺を使ったタイ風焼きそば",
-                    spiciness=2,
-                    sweetness=3,
-                    ingredients=["米麺", "エビ", "卵", "もやし", "ピーナッツ"],
-                    allergens=["甲殻類", "卵", "ナッツ"],
-                    category=Category.MAIN,
-                )
-            ],
-            raw_response="mock response",
-            provider="claude",
-            processing_time=1.5,
-        )
-        mock_factory.return_value = mock_provider
+        mock_factory.return_value.analyze_menu.return_value = pad_thai_result
 
         data = {"image": (BytesIO(sample_image), "menu.jpg")}
         response = client.post("/api/analyze", data=data)
@@ -128,28 +103,9 @@ class TestAnalyzeRoute:
         assert data["success"] is True
         assert len(data["dishes"]) == 1
 
-    @patch("app.routes.menu.AIProviderFactory.create")
-    def test_analyze_htmx_request(self, mock_factory, client, sample_image):
+    def test_analyze_htmx_request(self, mock_factory, client, sample_image, pad_thai_result):
         """HTMX リクエストテスト."""
-        mock_provider = Mock()
-        mock_provider.analyze_menu.return_value = AnalysisResult(
-            dishes=[
-                Dish(
-                    original_name="Pad Thai",
-                    translated_name="パッタイ",
-                    description="米麺を使ったタイ風焼きそば",
-                    spiciness=2,
-                    sweetness=3,
-                    ingredients=["米麺", "エビ", "卵", "もやし", "ピーナッツ"],
-                    allergens=["甲殻類", "卵", "ナッツ"],
-                    category=Category.MAIN,
-                )
-            ],
-            raw_response="mock response",
-            provider="claude",
-            processing_time=1.5,
-        )
-        mock_factory.return_value = mock_provider
+        mock_factory.return_value.analyze_menu.return_value = pad_thai_result
 
         response = client.post(
             "/api/analyze",
@@ -160,7 +116,6 @@ class TestAnalyzeRoute:
         assert response.status_code == 200
         assert b"dish-list" in response.data  # パーシャルが返される
 
-    @patch("app.routes.menu.AIProviderFactory.create")
     def test_api_error_handling(self, mock_factory, client, sample_image):
         """APIエラーハンドリングテスト."""
         mock_factory.return_value.analyze_menu.side_effect = AIProviderError("API Error")
@@ -171,7 +126,6 @@ class TestAnalyzeRoute:
         assert response.status_code == 500
         assert response.get_json()["code"] == "AI_ERROR"
 
-    @patch("app.routes.menu.AIProviderFactory.create")
     def test_api_error_handling_htmx(self, mock_factory, client, sample_image):
         """APIエラーハンドリングテスト（HTMX）."""
         mock_factory.return_value.analyze_menu.side_effect = AIProviderError("API Error")
@@ -183,7 +137,6 @@ class TestAnalyzeRoute:
         assert b"error-message" in response.data  # エラーパーシャルが返される
         assert b"AI_ERROR" in response.data  # エラーコードが含まれる
 
-    @patch("app.routes.menu.AIProviderFactory.create")
     def test_unexpected_error_htmx(self, mock_factory, client, sample_image):
         """予期しないエラーハンドリングテスト（HTMX）."""
         mock_factory.return_value.analyze_menu.side_effect = Exception("Unexpected error")
@@ -1,8 +1,8 @@
 """Tests for services and models."""
 
-import os
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
+import anthropic
 import pytest
 
 from app.models.dish import Category, Dish
@@ -10,6 +10,21 @@ from app.services.ai.base import AnalysisResult, APICallError, APIKeyMissingErro
 from app.services.ai.claude_provider import ClaudeProvider
 from app.services.ai.factory import AIProviderFactory, UnknownProviderError
 
+_VALID_DISH_KWARGS = {
+    "original_name": "Test",
+    "translated_name": "テスト",
+    "description": "テスト料理",
+    "spiciness": 3,
+    "sweetness": 3,
+}
+
+
+def _set_response(client, text):
+    """Make the mocked Anthropic client return a message with a single text block."""
+    message = Mock()
+    message.content = [Mock(text=text)]
+    client.messages.create.return_value = message
+
 
 class TestDishModel:
     """Tests for Dish model."""
@@ -61,65 +76,21 @@ class TestDishModel:
         assert result["allergens"] == ["甲殻類"]
         assert result["category"] == "appetizer"
 
-    def test_dish_validation_spiciness_out_of_range(self):
-        """Test validation for spiciness out of range (1-5)."""
-        with pytest.raises(ValueError, match="spiciness must be 1-5"):
-            Dish(
-                original_name="Test",
-                translated_name="テスト",
-                description="テスト料理",
-                spiciness=6,  # Invalid: out of range
-                sweetness=3,
-            )
-
-        with pytest.raises(ValueError, match="spiciness must be 1-5"):
-            Dish(
-                original_name="Test",
-                translated_name="テスト",
-                description="テスト料理",
-                spiciness=0,  # Invalid: out of range
-                sweetness=3,
-            )
-
-    def test_dish_validation_sweetness_out_of_range(self):
-        """Test validation for sweetness out of range (1-5)."""
-        with pytest.raises(ValueError, match="sweetness must be 1-5"):
-            Dish(
-                original_name="Test",
-                translated_name="テスト",
-                description="テスト料理",
-                spiciness=3,
-                sweetness=6,  # Invalid: out of range
-            )
-
-        with pytest.raises(ValueError, match="sweetness must be 1-5"):
-            Dish(
-                original_name="Test",
-                translated_name="テスト",
-                description="テスト料理",
-                spiciness=3,
-                sweetness=-1,  # Invalid: out of range
-            )
-
-    def test_dish_validation_type_error(self):
-        """Test validation for incorrect types."""
-        with pytest.raises(TypeError, match="spiciness must be an integer"):
-            Dish(
-                original_name="Test",
-                translated_name="テスト",
-                description="テスト料理",
-                spiciness="3",  # Invalid: should be int
-                sweetness=3,
-            )
-
-        with pytest.raises(TypeError, match="sweetness must be an integer"):
-            Dish(
-                original_name="Test",
-                translated_name="テスト",
-                description="テスト料理",
-                spiciness=3,
-                sweetness=3.5,  # Invalid: should be int
-            )
+    @pytest.mark.parametrize(
+        ("field", "value", "error", "message"),
+        [
+            ("spiciness", 6, ValueError, "spiciness must be 1-5"),
+            ("spiciness", 0, ValueError, "spiciness must be 1-5"),
+            ("sweetness", 6, ValueError, "sweetness must be 1-5"),
+            ("sweetness", -1, ValueError, "sweetness must be 1-5"),
+            ("spiciness", "3", TypeError, "spiciness must be an integer"),
+            ("sweetness", 3.5, TypeError, "sweetness must be an integer"),
+        ],
+    )
+    def test_dish_validation_fails(self, field, value, error, message):
+        """Test validation for spiciness/sweetness out of range (1-5) or of the wrong type."""
+        with pytest.raises(error, match=message):
+            Dish(**{**_VALID_DISH_KWARGS, field: value})
 
     def test_dish_from_dict_valid(self):
         """Test creating Dish from valid dictionary."""
@@ -190,6 +161,18 @@ class TestDishModel:
 class TestClaudeProvider:
     """Tests for ClaudeProvider."""
 
+    @pytest.fixture(autouse=True)
+    def _anthropic_api_key(self, monkeypatch):
+        """Set ANTHROPIC_API_KEY for every test in the class."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+
+    @pytest.fixture
+    def mock_client(self, monkeypatch):
+        """Make anthropic.Anthropic() return a Mock client and return that client."""
+        client = Mock()
+        monkeypatch.setattr(anthropic, "Anthropic", lambda **_: client)
+        return client
+
     def test_provider_name(self):
         """Test that provider name is correct."""
         provider = ClaudeProvider(api_key="sk-ant-test")
@@ -200,18 +183,9 @@ class TestClaudeProvider:
         with pytest.raises(APIKeyMissingError, match="API key is required"):
             ClaudeProvider(api_key="")
 
-    @patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}, clear=False)
-    @patch("anthropic.Anthropic")
-    def test_analyze_menu_success(self, mock_anthropic_class, sample_image, mock_claude_response):
+    def test_analyze_menu_success(self, mock_client, sample_image, mock_claude_response):
         """Test successful menu analysis with mocked API."""
-        # Setup mock
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-
-        # Mock API response
-        mock_message = Mock()
-        mock_message.content = [Mock(text=mock_claude_response)]
-        mock_client.messages.create.return_value = mock_message
+        _set_response(mock_client, mock_claude_response)
 
         # Test
         provider = ClaudeProvider(api_key="sk-ant-test")
@@ -232,29 +206,21 @@ class TestClaudeProvider:
         # Verify API was called
         mock_client.messages.create.assert_called_once()
 
-    @patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}, clear=False)
-    def test_image_size_exceeds_limit(self, sample_image):
+    def test_image_size_exceeds_limit(self, monkeypatch):
         """Test that APICallError is raised when image size exceeds limit."""
+        # Lower the limit so the test does not have to allocate 10MB
+        monkeypatch.setattr(ClaudeProvider, "MAX_IMAGE_SIZE", 8)
         provider = ClaudeProvider(api_key="sk-ant-test")
-        # Create image data larger than MAX_IMAGE_SIZE (10MB)
         large_image_data = b"x" * (ClaudeProvider.MAX_IMAGE_SIZE + 1)
         mime_type = "image/png"
 
         with pytest.raises(APICallError, match="Image size .* exceeds maximum"):
             provider.analyze_menu(large_image_data, mime_type)
 
-    @patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}, clear=False)
-    @patch("anthropic.Anthropic")
-    def test_image_size_at_boundary(self, mock_anthropic_class, mock_claude_response):
+    def test_image_size_at_boundary(self, mock_client, mock_claude_response, monkeypatch):
         """Test that image at exactly MAX_IMAGE_SIZE is accepted."""
-        # Setup mock
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-
-        # Mock API response
-        mock_message = Mock()
-        mock_message.content = [Mock(text=mock_claude_response)]
-        mock_client.messages.create.return_value = mock_message
+        _set_response(mock_client, mock_claude_response)
+        monkeypatch.setattr(ClaudeProvider, "MAX_IMAGE_SIZE", 8)
 
         # Test with image exactly at MAX_IMAGE_SIZE
         provider = ClaudeProvider(api_key="sk-ant-test")
@@ -268,23 +234,9 @@ class TestClaudeProvider:
         assert isinstance(result, AnalysisResult)
         assert len(result.dishes) == 2
 
-    @patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}, clear=False)
-    @patch("anthropic.Anthropic")
-    def test_api_error_handling(self, mock_anthropic_class, sample_image):
+    def test_api_error_handling(self, mock_client, sample_image, anthropic_api_error):
         """Test API error handling."""
-        from anthropic import APIError
-
-        # Setup mock to raise API error
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-
-        # Create a proper APIError instance with required arguments
-        api_error = APIError(
-            message="API Error",
-            request=Mock(),
-            body=None,
-        )
-        mock_client.messages.create.side_effect = api_error
+        mock_client.messages.create.side_effect = anthropic_api_error
 
         # Test
         provider = ClaudeProvider(api_key="sk-ant-test")
@@ -293,16 +245,9 @@ class TestClaudeProvider:
         with pytest.raises(APICallError, match="Claude API call failed"):
             provider.analyze_menu(image_data, mime_type)
 
-    @patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}, clear=False)
-    @patch("anthropic.Anthropic")
-    def test_parse_response_invalid_json(self, mock_anthropic_class, sample_image):
+    def test_parse_response_invalid_json(self, mock_client, sample_image):
         """Test error handling for invalid JSON response."""
-        # Setup mock with invalid JSON
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-        mock_message = Mock()
-        mock_message.content = [Mock(text="This is not JSON")]
-        mock_client.messages.create.return_value = mock_message
+        _set_response(mock_client, "This is not JSON")
 
         # Test
         provider = ClaudeProvider(api_key="sk-ant-test")
@@ -311,16 +256,9 @@ class TestClaudeProvider:
         with pytest.raises(APICallError, match="Failed to parse"):
             provider.analyze_menu(image_data, mime_type)
 
-    @patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-key"}, clear=False)
-    @patch("anthropic.Anthropic")
-    def test_parse_response_missing_dishes_key(self, mock_anthropic_class, sample_image):
+    def test_parse_response_missing_dishes_key(self, mock_client, sample_image):
         """Test error handling when response is missing 'dishes' key."""
-        # Setup mock with JSON missing 'dishes' key
-        mock_client = Mock()
-        mock_anthropic_class.return_value = mock_client
-        mock_message = Mock()
-        mock_message.content = [Mock(text='{"invalid": "structure"}')]
-        mock_client.messages.create.return_value = mock_message
+        _set_response(mock_client, '{"invalid": "structure"}')
 
         # Test
         provider = ClaudeProvider(api_key="sk-ant-test")
@@ -333,15 +271,12 @@ class TestClaudeProvider:
 class TestAIProviderFactory:
     """Tests for AIProviderFactory."""
 
-    def test_create_claude_provider(self):
-        """Test creating Claude provider from factory."""
-        provider = AIProviderFactory.create(api_key="sk-ant-test")
-        assert isinstance(provider, ClaudeProvider)
-        assert provider.name == "claude"
-
-    def test_create_with_explicit_provider_name(self):
-        """Test creating provider with explicit provider name."""
-        provider = AIProviderFactory.create(api_key="sk-ant-test", provider_name="claude")
+    @pytest.mark.parametrize(
+        "kwargs", [{}, {"provider_name": "claude"}], ids=["default", "explicit_name"]
+    )
+    def test_create_claude_provider(self, kwargs):
+        """Test creating Claude provider from factory, by default or by explicit name."""
+        provider = AIProviderFactory.create(api_key="sk-ant-test", **kwargs)
         assert isinstance(provider, ClaudeProvider)
         assert provider.name == "claude"
 
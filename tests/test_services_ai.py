@@ -1,10 +1,14 @@
 """Tests for AI provider base classes."""
 
+import base64
 import json
-import os
-from unittest.mock import MagicMock, patch
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import patch
 
+import anthropic
 import pytest
+from PIL import Image
 
 from app.models.dish import Category, Dish
 from app.services.ai.base import (
@@ -18,36 +22,138 @@ from app.services.ai.base import (
 from app.services.ai.claude_provider import ClaudeProvider
 from app.services.ai.factory import AIProviderFactory, UnknownProviderError
 
+# Client settings the Anthropic SDK reads from the environment
+_ANTHROPIC_ENV_VARS = ("ANTHROPIC_API_KEY", "ANTHROPIC_AUTH_TOKEN", "ANTHROPIC_BASE_URL")
+
+# Valid dishes for tests that only need well-formed Dish objects (validated once at import)
+_PAD_THAI = Dish(
+    original_name="Pad Thai",
+    translated_name="パッタイ",
+    description="米麺を使ったタイ風焼きそば",
+    spiciness=2,
+    sweetness=3,
+    ingredients=["米麺", "エビ"],
+    allergens=["甲殻類"],
+    category=Category.MAIN,
+)
+
+_TOM_YUM_SOUP = Dish(
+    original_name="Tom Yum Soup",
+    translated_name="トムヤムスープ",
+    description="辛酸っぱいタイ風スープ",
+    spiciness=4,
+    sweetness=1,
+    ingredients=["エビ", "レモングラス", "唐辛子"],
+    allergens=["甲殻類"],
+    category=Category.APPETIZER,
+)
+
+# Claude response bodies shared by the parse/analyze tests (serialized once at import)
+_PAD_THAI_RESPONSE = json.dumps(
+    {
+        "dishes": [
+            {
+                "original_name": "Pad Thai",
+                "translated_name": "パッタイ",
+                "description": "米麺を使ったタイ風焼きそば",
+                "spiciness": 2,
+                "sweetness": 3,
+                "ingredients": ["米麺", "エビ", "卵"],
+                "allergens": ["甲殻類", "卵"],
+                "category": "main",
+            }
+        ]
+    }
+)
+_TOM_YUM_RESPONSE = json.dumps(
+    {
+        "dishes": [
+            {
+                "original_name": "Tom Yum",
+                "translated_name": "トムヤム",
+                "description": "辛酸っぱいスープ",
+                "spiciness": 4,
+                "sweetness": 1,
+                "ingredients": ["エビ", "レモングラス"],
+                "allergens": ["甲殻類"],
+                "category": "appetizer",
+            }
+        ]
+    }
+)
+_GREEN_CURRY_RESPONSE = json.dumps(
+    {
+        "dishes": [
+            {
+                "original_name": "Green Curry",
+                "translated_name": "グリーンカレー",
+                "description": "タイのグリーンカレー",
+                "spiciness": 4,
+                "sweetness": 2,
+                "ingredients": ["鶏肉", "ココナッツミルク", "バジル"],
+                "allergens": [],
+                "category": "main",
+            }
+        ]
+    }
+)
+_PARTLY_INVALID_RESPONSE = json.dumps(
+    {
+        "dishes": [
+            {
+                # Invalid: missing required fields
+                "original_name": "Invalid Dish",
+            },
+            {
+                # Valid dish
+                "original_name": "Valid Dish",
+                "translated_name": "有効な料理",
+                "description": "これは有効な料理です",
+                "spiciness": 3,
+                "sweetness": 3,
+                "ingredients": ["材料1"],
+                "allergens": [],
+                "category": "main",
+            },
+        ]
+    }
+)
+
+# Implementations of AIProvider's abstract members, for building incomplete subclasses
+_PROVIDER_MEMBERS = {
+    "name": property(lambda self: "incomplete"),
+    "analyze_menu": lambda self, image_data, mime_type: None,
+}
+
+
+class _FakeMessages:
+    """Stand-in for ``client.messages`` that records create() calls (lighter than MagicMock)."""
+
+    def __init__(self, text=None, error=None):
+        self.text = text
+        self.error = error
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)])
+
+
+def _patch_anthropic(monkeypatch, messages):
+    """Make anthropic.Anthropic() return a client whose ``messages`` is the given stub."""
+    client = SimpleNamespace(messages=messages)
+    monkeypatch.setattr(anthropic, "Anthropic", lambda **_: client)
+
 
 class TestAnalysisResult:
     """Test cases for AnalysisResult dataclass."""
 
     def test_analysis_result_creation(self):
         """Test creating an AnalysisResult with all fields."""
-        dish1 = Dish(
-            original_name="Pad Thai",
-            translated_name="パッタイ",
-            description="米麺を使ったタイ風焼きそば",
-            spiciness=2,
-            sweetness=3,
-            ingredients=["米麺", "エビ"],
-            allergens=["甲殻類"],
-            category=Category.MAIN,
-        )
-
-        dish2 = Dish(
-            original_name="Tom Yum Soup",
-            translated_name="トムヤムスープ",
-            description="辛酸っぱいタイ風スープ",
-            spiciness=4,
-            sweetness=1,
-            ingredients=["エビ", "レモングラス", "唐辛子"],
-            allergens=["甲殻類"],
-            category=Category.APPETIZER,
-        )
-
         result = AnalysisResult(
-            dishes=[dish1, dish2],
+            dishes=[_PAD_THAI, _TOM_YUM_SOUP],
             raw_response='{"dishes": [...]}',
             provider="claude",
             processing_time=1.23,
@@ -83,32 +189,14 @@ class TestAIProvider:
         with pytest.raises(TypeError, match="Can't instantiate abstract class"):
             AIProvider()  # type: ignore
 
-    def test_subclass_without_name_property_raises_error(self):
-        """Test that subclass without name property cannot be instantiated."""
-
-        class IncompleteProvider(AIProvider):
-            def analyze_menu(self, image_data: bytes, mime_type: str) -> AnalysisResult:
-                pass
-
-            def is_available(self) -> bool:
-                pass
+    @pytest.mark.parametrize("missing", list(_PROVIDER_MEMBERS))
+    def test_subclass_without_abstract_member_raises_error(self, missing):
+        """Test that a subclass missing name or analyze_menu cannot be instantiated."""
+        members = {k: v for k, v in _PROVIDER_MEMBERS.items() if k != missing}
+        incomplete_provider = type("IncompleteProvider", (AIProvider,), members)
 
         with pytest.raises(TypeError, match="Can't instantiate abstract class"):
-            IncompleteProvider()  # type: ignore
-
-    def test_subclass_without_analyze_menu_raises_error(self):
-        """Test that subclass without analyze_menu cannot be instantiated."""
-
-        class IncompleteProvider(AIProvider):
-            @property
-            def name(self) -> str:
-                return "incomplete"
-
-            def is_available(self) -> bool:
-                pass
-
-        with pytest.raises(TypeError, match="Can't instantiate abstract class"):
-            IncompleteProvider()  # type: ignore
+            incomplete_provider()
 
     def test_complete_subclass_can_be_instantiated(self):
         """Test that a complete subclass can be instantiated."""
@@ -145,24 +233,23 @@ class TestAIProvider:
 class TestAIProviderExceptions:
     """Test cases for AI provider exception classes."""
 
-    def test_ai_provider_error_can_be_raised(self):
-        """Test that AIProviderError can be raised and caught."""
-        with pytest.raises(AIProviderError, match="Generic AI provider error"):
-            raise AIProviderError("Generic AI provider error")
-
-    def test_api_key_missing_error_is_ai_provider_error(self):
-        """Test that APIKeyMissingError is a subclass of AIProviderError."""
-        assert issubclass(APIKeyMissingError, AIProviderError)
-
-        with pytest.raises(AIProviderError):
-            raise APIKeyMissingError("API key is missing")
-
-    def test_api_call_error_is_ai_provider_error(self):
-        """Test that APICallError is a subclass of AIProviderError."""
-        assert issubclass(APICallError, AIProviderError)
-
-        with pytest.raises(AIProviderError):
-            raise APICallError("API call failed")
+    @pytest.mark.parametrize("error_class", [APIKeyMissingError, APICallError])
+    def test_specific_errors_are_ai_provider_errors(self, error_class):
+        """Test that APIKeyMissingError and APICallError subclass AIProviderError."""
+        assert issubclass(error_class, AIProviderError)
+
+    @pytest.mark.parametrize(
+        ("error_class", "message"),
+        [
+            (AIProviderError, "Generic AI provider error"),
+            (APIKeyMissingError, "API key is missing"),
+            (APICallError, "API call failed"),
+        ],
+    )
+    def test_base_exception_catches_provider_errors(self, error_class, message):
+        """Test that every provider error can be raised and caught as AIProviderError."""
+        with pytest.raises(AIProviderError, match=message):
+            raise error_class(message)
 
     def test_can_catch_specific_exception(self):
         """Test that specific exceptions can be caught separately."""
@@ -173,20 +260,25 @@ class TestAIProviderExceptions:
         except AIProviderError:
             pytest.fail("Should have caught APIKeyMissingError")
 
-    def test_can_catch_base_exception(self):
-        """Test that base exception can catch all provider errors."""
-        caught = False
-        try:
-            raise APICallError("API failed")
-        except AIProviderError:
-            caught = True
-
-        assert caught is True
-
 
 class TestClaudeProvider:
     """Test cases for ClaudeProvider."""
 
+    @pytest.fixture(autouse=True)
+    def _isolate_anthropic_env(self, monkeypatch):
+        """Keep the developer's Anthropic client settings out of these tests."""
+        for name in _ANTHROPIC_ENV_VARS:
+            monkeypatch.delenv(name, raising=False)
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def provider(cls):
+        """ClaudeProvider shared by the tests that only use _build_prompt/_parse_response."""
+        with pytest.MonkeyPatch.context() as mp:
+            for name in _ANTHROPIC_ENV_VARS:
+                mp.delenv(name, raising=False)
+            return ClaudeProvider(api_key="sk-ant-test")
+
     def test_initialization_with_api_key(self):
         """Test ClaudeProvider initialization with API key."""
         provider = ClaudeProvider(api_key="sk-ant-test")
@@ -198,230 +290,135 @@ class TestClaudeProvider:
         with pytest.raises(APIKeyMissingError, match="API key is required"):
             ClaudeProvider(api_key="")
 
-    def test_name_property(self):
+    def test_name_property(self, provider):
         """Test that name property returns 'claude'."""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-            assert provider.name == "claude"
+        assert provider.name == "claude"
 
-    def test_build_prompt(self):
+    def test_build_prompt(self, provider):
         """Test that _build_prompt returns appropriate prompt text."""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-            prompt = provider._build_prompt()
-
-            # Verify prompt contains key requirements
-            assert "JSON" in prompt
-            assert "original_name" in prompt
-            assert "translated_name" in prompt
-            assert "spiciness" in prompt
-            assert "sweetness" in prompt
-            assert "ingredients" in prompt
-            assert "allergens" in prompt
-            assert "category" in prompt
-
-    def test_parse_response_valid_json(self):
+        prompt = provider._build_prompt()
+
+        # Verify prompt contains key requirements
+        assert "JSON" in prompt
+        assert "original_name" in prompt
+        assert "translated_name" in prompt
+        assert "spiciness" in prompt
+        assert "sweetness" in prompt
+        assert "ingredients" in prompt
+        assert "allergens" in prompt
+        assert "category" in prompt
+
+    def test_parse_response_valid_json(self, provider):
         """Test parsing valid JSON response."""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-
-            response_json = {
-                "dishes": [
-                    {
-                        "original_name": "Pad Thai",
-                        "translated_name": "パッタイ",
-                        "description": "米麺を使ったタイ風焼きそば",
-                        "spiciness": 2,
-                        "sweetness": 3,
-                        "ingredients": ["米麺", "エビ", "卵"],
-                        "allergens": ["甲殻類", "卵"],
-                        "category": "main",
-                    }
-                ]
-            }
-
-            dishes = provider._parse_response(json.dumps(response_json))
-
-            assert len(dishes) == 1
-            assert dishes[0].original_name == "Pad Thai"
-            assert dishes[0].translated_name == "パッタイ"
-            assert dishes[0].spiciness == 2
-            assert dishes[0].sweetness == 3
-            assert dishes[0].category == Category.MAIN
-
-    def test_parse_response_with_markdown_code_block(self):
-        """Test parsing JSON wrapped in markdown code block."""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-
-            response_json = {
-                "dishes": [
-                    {
-                        "original_name": "Tom Yum",
-                        "translated_name": "トムヤム",
-                        "description": "辛酸っぱいスープ",
-                        "spiciness": 4,
-                        "sweetness": 1,
-                        "ingredients": ["エビ", "レモングラス"],
-                        "allergens": ["甲殻類"],
-                        "category": "appetizer",
-                    }
-                ]
-            }
-
-            # Test with ```json wrapper
-            response = f"```json\n{json.dumps(response_json)}\n```"
-            dishes = provider._parse_response(response)
-
-            assert len(dishes) == 1
-            assert dishes[0].original_name == "Tom Yum"
-
-            # Test with ``` wrapper
-            response = f"```\n{json.dumps(response_json)}\n```"
-            dishes = provider._parse_response(response)
-
-            assert len(dishes) == 1
-            assert dishes[0].original_name == "Tom Yum"
-
-    def test_parse_response_invalid_json(self):
+        dishes = provider._parse_response(_PAD_THAI_RESPONSE)
+
+        assert len(dishes) == 1
+        assert dishes[0].original_name == "Pad Thai"
+        assert dishes[0].translated_name == "パッタイ"
+        assert dishes[0].spiciness == 2
+        assert dishes[0].sweetness == 3
+        assert dishes[0].category == Category.MAIN
+
+    @pytest.mark.parametrize(
+        "fence", ["```json\n{}\n```", "```\n{}\n```"], ids=["json_fence", "bare_fence"]
+    )
+    def test_parse_response_with_markdown_code_block(self, provider, fence):
+        """Test parsing JSON wrapped in a ```json or bare ``` markdown code block."""
+        dishes = provider._parse_response(fence.format(_TOM_YUM_RESPONSE))
+
+        assert len(dishes) == 1
+        assert dishes[0].original_name == "Tom Yum"
+
+    def test_parse_response_invalid_json(self, provider):
         """Test that invalid JSON raises APICallError."""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-
-            with pytest.raises(APICallError, match="Failed to parse JSON response"):
-                provider._parse_response("This is not JSON")
+        with pytest.raises(APICallError, match="Failed to parse JSON response"):
+            provider._parse_response("This is not JSON")
 
-    def test_parse_response_missing_dishes_key(self):
+    def test_parse_response_missing_dishes_key(self, provider):
         """Test that response without 'dishes' key raises APICallError."""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-
-            response_json = {"menu": []}
+        with pytest.raises(APICallError, match="Response must contain 'dishes' key"):
+            provider._parse_response('{"menu": []}')
 
-            with pytest.raises(APICallError, match="Response must contain 'dishes' key"):
-                provider._parse_response(json.dumps(response_json))
-
-    def test_parse_response_empty_dishes(self):
+    def test_parse_response_empty_dishes(self, provider):
         """Test that empty dishes list raises InvalidMenuImageError."""
-        provider = ClaudeProvider(api_key="test-api-key")
-
-        response_json = {"dishes": []}
-
         with pytest.raises(InvalidMenuImageError, match="Could not detect menu from image"):
-            provider._parse_response(json.dumps(response_json))
+            provider._parse_response('{"dishes": []}')
 
-    def test_parse_response_skips_invalid_dishes(self):
+    def test_parse_response_skips_invalid_dishes(self, provider):
         """Test that invalid dishes are skipped but valid ones are kept."""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-
-            response_json = {
-                "dishes": [
-                    {
-                        # Invalid: missing required fields
-                        "original_name": "Invalid Dish",
-                    },
-                    {
-                        # Valid dish
-                        "original_name": "Valid Dish",
-                        "translated_name": "有効な料理",
-                        "description": "これは有効な料理です",
-                        "spiciness": 3,
-                        "sweetness": 3,
-                        "ingredients": ["材料1"],
-                        "allergens": [],
-                        "category": "main",
-                    },
-                ]
-            }
-
-            dishes = provider._parse_response(json.dumps(response_json))
+        dishes = provider._parse_response(_PARTLY_INVALID_RESPONSE)
 
-            # Should skip invalid dish and only return valid one
-            assert len(dishes) == 1
-            assert dishes[0].original_name == "Valid Dish"
+        # Should skip invalid dish and only return valid one
+        assert len(dishes) == 1
+        assert dishes[0].original_name == "Valid Dish"
 
-    def test_build_prompt_includes_number_field(self):
+    def test_build_prompt_includes_number_field(self, provider):
         """プロンプトに number フィールドの指示と出力例が含まれる"""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-            prompt = provider._build_prompt()
+        prompt = provider._build_prompt()
 
-            # 指示文と出力例の両方に含まれることを確認
-            assert "number" in prompt
-            assert '"number": 1' in prompt
+        # 指示文と出力例の両方に含まれることを確認
+        assert "number" in prompt
+        assert '"number": 1' in prompt
 
-    def test_parse_response_sorts_by_number(self):
+    def test_parse_response_sorts_by_number(self, provider):
         """numberが全dishに付いている場合、numberの昇順にソートされる"""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-
-            response_json = {
-                "dishes": [
-                    self._build_dish_dict("Third", 3),
-                    self._build_dish_dict("First", 1),
-                    self._build_dish_dict("Second", 2),
-                ]
-            }
+        response_json = {
+            "dishes": [
+                self._build_dish_dict("Third", 3),
+                self._build_dish_dict("First", 1),
+                self._build_dish_dict("Second", 2),
+            ]
+        }
 
-            dishes = provider._parse_response(json.dumps(response_json))
+        dishes = provider._parse_response(json.dumps(response_json))
 
-            assert [d.number for d in dishes] == [1, 2, 3]
-            assert [d.original_name for d in dishes] == ["First", "Second", "Third"]
+        assert [d.number for d in dishes] == [1, 2, 3]
+        assert [d.original_name for d in dishes] == ["First", "Second", "Third"]
 
-    def test_parse_response_reassigns_numbers_on_missing(self):
+    def test_parse_response_reassigns_numbers_on_missing(self, provider):
         """numberが欠損しているdishがあれば、全体を1から振り直す"""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-
-            response_json = {
-                "dishes": [
-                    self._build_dish_dict("A", 1),
-                    self._build_dish_dict("B", None),  # 欠損
-                    self._build_dish_dict("C", 3),
-                ]
-            }
+        response_json = {
+            "dishes": [
+                self._build_dish_dict("A", 1),
+                self._build_dish_dict("B", None),  # 欠損
+                self._build_dish_dict("C", 3),
+            ]
+        }
 
-            dishes = provider._parse_response(json.dumps(response_json))
+        dishes = provider._parse_response(json.dumps(response_json))
 
-            assert [d.number for d in dishes] == [1, 2, 3]
-            assert [d.original_name for d in dishes] == ["A", "B", "C"]
+        assert [d.number for d in dishes] == [1, 2, 3]
+        assert [d.original_name for d in dishes] == ["A", "B", "C"]
 
-    def test_parse_response_reassigns_numbers_on_duplicate(self):
+    def test_parse_response_reassigns_numbers_on_duplicate(self, provider):
         """numberが重複しているdishがあれば、全体を1から振り直す"""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-
-            response_json = {
-                "dishes": [
-                    self._build_dish_dict("A", 1),
-                    self._build_dish_dict("B", 1),  # 重複
-                    self._build_dish_dict("C", 2),
-                ]
-            }
+        response_json = {
+            "dishes": [
+                self._build_dish_dict("A", 1),
+                self._build_dish_dict("B", 1),  # 重複
+                self._build_dish_dict("C", 2),
+            ]
+        }
 
-            dishes = provider._parse_response(json.dumps(response_json))
+        dishes = provider._parse_response(json.dumps(response_json))
 
-            assert [d.number for d in dishes] == [1, 2, 3]
+        assert [d.number for d in dishes] == [1, 2, 3]
 
-    def test_parse_response_reassigns_numbers_on_non_sequential(self):
+    def test_parse_response_reassigns_numbers_on_non_sequential(self, provider):
         """numberが非連続の場合（無効dishスキップ等で飛び番化）は振り直す"""
-        with patch.dict(os.environ, {}, clear=True):
-            provider = ClaudeProvider(api_key="sk-ant-test")
-
-            # AIが [1, 2, 3, 4] を返したが #2 が不正でスキップされ [1, 3, 4] になる想定
-            response_json = {
-                "dishes": [
-                    self._build_dish_dict("A", 1),
-                    self._build_dish_dict("C", 3),  # 非連続（2が抜け）
-                    self._build_dish_dict("D", 4),
-                ]
-            }
+        # AIが [1, 2, 3, 4] を返したが #2 が不正でスキップされ [1, 3, 4] になる想定
+        response_json = {
+            "dishes": [
+                self._build_dish_dict("A", 1),
+                self._build_dish_dict("C", 3),  # 非連続（2が抜け）
+                self._build_dish_dict("D", 4),
+            ]
+        }
 
-            dishes = provider._parse_response(json.dumps(response_json))
+        dishes = provider._parse_response(json.dumps(response_json))
 
-            assert [d.number for d in dishes] == [1, 2, 3]
-            assert [d.original_name for d in dishes] == ["A", "C", "D"]
+        assert [d.number for d in dishes] == [1, 2, 3]
+        assert [d.original_name for d in dishes] == ["A", "C", "D"]
 
     @staticmethod
     def _build_dish_dict(name: str, number: int | None) -> dict:
@@ -445,80 +442,82 @@ class TestClaudeProvider:
         with pytest.raises(APIKeyMissingError, match="API key is required"):
             ClaudeProvider(api_key="")
 
-    def test_analyze_menu_image_size_exceeds_limit(self):
+    def test_analyze_menu_image_size_exceeds_limit(self, monkeypatch):
         """Test that analyze_menu raises APICallError when image size exceeds limit."""
-        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-api-key"}):
-            provider = ClaudeProvider(api_key="sk-ant-test")
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-api-key")
 
-            # Create image data larger than MAX_IMAGE_SIZE (10MB)
-            large_image_data = b"x" * (provider.MAX_IMAGE_SIZE + 1)
+        # Lower the limit so the test does not have to allocate 10MB
+        monkeypatch.setattr(ClaudeProvider, "MAX_IMAGE_SIZE", 8)
+        provider = ClaudeProvider(api_key="sk-ant-test")
+
+        large_image_data = b"x" * (provider.MAX_IMAGE_SIZE + 1)
 
-            with pytest.raises(APICallError, match="Image size .* bytes exceeds maximum .* bytes"):
-                provider.analyze_menu(large_image_data, "image/jpeg")
+        with pytest.raises(APICallError, match="Image size .* bytes exceeds maximum .* bytes"):
+            provider.analyze_menu(large_image_data, "image/jpeg")
 
-    @patch("anthropic.Anthropic")
-    def test_analyze_menu_success(self, mock_anthropic_class):
+    def test_analyze_menu_success(self, monkeypatch):
         """Test successful menu analysis."""
-        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-api-key"}):
-            # Setup mock
-            mock_client = MagicMock()
-            mock_anthropic_class.return_value = mock_client
-
-            response_json = {
-                "dishes": [
-                    {
-                        "original_name": "Green Curry",
-                        "translated_name": "グリーンカレー",
-                        "description": "タイのグリーンカレー",
-                        "spiciness": 4,
-                        "sweetness": 2,
-                        "ingredients": ["鶏肉", "ココナッツミルク", "バジル"],
-                        "allergens": [],
-                        "category": "main",
-                    }
-                ]
-            }
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-api-key")
 
-            mock_response = MagicMock()
-            mock_response.content = [MagicMock(text=json.dumps(response_json))]
-            mock_client.messages.create.return_value = mock_response
+        messages = _FakeMessages(text=_GREEN_CURRY_RESPONSE)
+        _patch_anthropic(monkeypatch, messages)
 
-            provider = ClaudeProvider(api_key="sk-ant-test")
-            result = provider.analyze_menu(b"fake image data", "image/jpeg")
+        provider = ClaudeProvider(api_key="sk-ant-test")
+        result = provider.analyze_menu(b"fake image data", "image/jpeg")
 
-            # Verify result
-            assert result.provider == "claude"
-            assert len(result.dishes) == 1
-            assert result.dishes[0].original_name == "Green Curry"
-            assert result.processing_time > 0
+        # Verify result
+        assert result.provider == "claude"
+        assert len(result.dishes) == 1
+        assert result.dishes[0].original_name == "Green Curry"
+        assert result.processing_time > 0
+
+        # Verify API call
+        assert len(messages.calls) == 1
+        call_kwargs = messages.calls[0]
+        assert call_kwargs["model"] == ClaudeProvider.MODEL
+        assert call_kwargs["max_tokens"] == 8192
+        image_source = call_kwargs["messages"][0]["content"][0]["source"]
+        assert image_source["data"] == base64.b64encode(b"fake image data").decode("ascii")
+
+    def test_analyze_menu_downscales_large_image(self, monkeypatch):
+        """Images over MAX_IMAGE_EDGE are sent as a JPEG shrunk to that edge."""
+        messages = _FakeMessages(text=_GREEN_CURRY_RESPONSE)
+        _patch_anthropic(monkeypatch, messages)
+        buffer = BytesIO()
+        Image.new("RGB", (3000, 2000), color="red").save(buffer, format="PNG")
+
+        ClaudeProvider(api_key="sk-ant-test").analyze_menu(buffer.getvalue(), "image/png")
+
+        image_source = messages.calls[0]["messages"][0]["content"][0]["source"]
+        assert image_source["media_type"] == "image/jpeg"
+        with Image.open(BytesIO(base64.b64decode(image_source["data"]))) as sent:
+            assert sent.size == (1568, 1045)
+
+    def test_analyze_menu_builds_prompt_once(self, monkeypatch):
+        """The prompt is built on the first call and reused afterwards."""
+        response_json = {"dishes": [self._build_dish_dict("Pad Thai", 1)]}
+        messages = _FakeMessages(text=json.dumps(response_json))
+        _patch_anthropic(monkeypatch, messages)
 
-            # Verify API call
-            mock_client.messages.create.assert_called_once()
-            call_args = mock_client.messages.create.call_args
-            assert call_args[1]["model"] == ClaudeProvider.MODEL
-            assert call_args[1]["max_tokens"] == 8192
+        provider = ClaudeProvider(api_key="sk-ant-test")
+        with patch.object(provider, "_build_prompt", return_value="prompt") as mock_build:
+            provider.analyze_menu(b"fake image data", "image/jpeg")
+            provider.analyze_menu(b"fake image data", "image/jpeg")
 
-    @patch("anthropic.Anthropic")
-    def test_analyze_menu_api_error(self, mock_anthropic_class):
-        """Test that API errors are properly handled."""
-        import anthropic
+        mock_build.assert_called_once_with()
+        text_block = messages.calls[-1]["messages"][0]["content"][1]
+        assert text_block == {"type": "text", "text": "prompt"}
 
-        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-api-key"}):
-            mock_client = MagicMock()
-            mock_anthropic_class.return_value = mock_client
+    def test_analyze_menu_api_error(self, monkeypatch, anthropic_api_error):
+        """Test that API errors are properly handled."""
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-api-key")
 
-            # Simulate API error with properly mocked anthropic.APIError
-            api_error = anthropic.APIError(
-                message="API Error",
-                request=MagicMock(),
-                body=None,
-            )
-            mock_client.messages.create.side_effect = api_error
+        _patch_anthropic(monkeypatch, _FakeMessages(error=anthropic_api_error))
 
-            provider = ClaudeProvider(api_key="sk-ant-test")
+        provider = ClaudeProvider(api_key="sk-ant-test")
 
-            with pytest.raises(APICallError, match="Claude API call failed"):
-                provider.analyze_menu(b"fake image data", "image/jpeg")
+        with pytest.raises(APICallError, match="Claude API call failed"):
+            provider.analyze_menu(b"fake image data", "image/jpeg")
 
 
 class TestAIProviderFactory:
@@ -594,12 +593,29 @@ class TestAIProviderFactory:
         # Clean up
         del AIProviderFactory._providers["custom"]
 
-    def test_available_providers_returns_list(self):
+    def test_create_reuses_instance_per_key_and_language(self):
+        """Providers are cached per (class, api_key, language)."""
+        first = AIProviderFactory.create(api_key="sk-ant-test")
+        assert AIProviderFactory.create(api_key="sk-ant-test") is first
+        assert AIProviderFactory.create(api_key="sk-ant-other") is not first
+        assert AIProviderFactory.create(api_key="sk-ant-test", language="ja") is not first
+
+    def test_create_cache_evicts_oldest_entry(self, monkeypatch):
+        """The cache is bounded by MAX_CACHED_PROVIDERS."""
+        monkeypatch.setattr(AIProviderFactory, "MAX_CACHED_PROVIDERS", 2)
+        first = AIProviderFactory.create(api_key="sk-ant-1")
+        AIProviderFactory.create(api_key="sk-ant-2")
+        AIProviderFactory.create(api_key="sk-ant-3")
+        assert len(AIProviderFactory._instances) == 2
+        assert AIProviderFactory.create(api_key="sk-ant-1") is not first
+
+    def test_available_providers_returns_list(self, monkeypatch):
         """Test that available_providers returns list of available providers."""
-        with patch.dict(os.environ, {"ANTHROPIC_API_KEY": "test-api-key"}):
-            providers = AIProviderFactory.available_providers()
-            assert isinstance(providers, list)
-            assert "claude" in providers
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-api-key")
+
+        providers = AIProviderFactory.available_providers()
+        assert isinstance(providers, list)
+        assert "claude" in providers
 
     def test_available_providers_returns_registered_names(self):
         """available_providers returns all registered provider names (no env check)."""
@@ -2,181 +2,149 @@
 
 from datetime import datetime
 
-
-def test_base_template_renders_with_title(app):
-    """Test that base template renders with custom title."""
+import pytest
+from flask import render_template_string
+
+# Year the footer should show; read once when the module is collected
+CURRENT_YEAR = datetime.now().year
+
+EMPTY_PAGE_TEMPLATE = """
+{% extends "base.html" %}
+{% block content %}{% endblock %}
+"""
+
+BASE_REQUIRED_SNIPPETS = [
+    # Meta tags
+    '<meta charset="UTF-8">',
+    '<meta name="viewport"',
+    # CSS and JS libraries (local files, not CDN)
+    "css/app.css",
+    "js/vendor/htmx.min.js",
+    "js/vendor/alpinejs.min.js",
+    "js/app.js",
+    # Structural elements
+    "<header",
+    "<main",
+    "<footer",
+    'id="toast-container"',
+    # Flexbox layout for footer positioning
+    "flex flex-col",
+    "flex-grow",
+    # Branding
+    "Menu Judge",
+]
+
+BASE_FORBIDDEN_SNIPPETS = [
+    "unpkg.com",  # No CDN usage
+    'class="dark"',  # Light mode only
+]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _request_context(app):
+    """Share one request context across the module instead of pushing one per test."""
     with app.test_request_context():
-        from flask import render_template_string
-
-        template = """
-        {% extends "base.html" %}
-        {% block title %}Test Title{% endblock %}
-        {% block content %}Test Content{% endblock %}
-        """
-        rendered = render_template_string(template)
-
-        assert "Test Title" in rendered
-        assert "Test Content" in rendered
-
-
-def test_base_template_has_required_elements(app):
-    """Test that base template contains required HTML elements."""
-    with app.test_request_context():
-        from flask import render_template_string
-
-        template = """
-        {% extends "base.html" %}
-        {% block content %}{% endblock %}
-        """
-        rendered = render_template_string(template)
+        yield
 
-        # Check for required meta tags
-        assert '<meta charset="UTF-8">' in rendered
-        assert '<meta name="viewport"' in rendered
 
-        # Check for required CSS
-        assert "css/app.css" in rendered
+@pytest.fixture(scope="module")
+def base_rendered():
+    """Render base.html with an empty content block once for the whole module.
 
-        # Check for required JS libraries (local files, not CDN)
-        assert "js/vendor/htmx.min.js" in rendered
-        assert "js/vendor/alpinejs.min.js" in rendered
-        assert "unpkg.com" not in rendered  # Ensure no CDN usage
+    Returns:
+        str: Rendered HTML shared by the tests that only inspect the base layout.
+    """
+    return render_template_string(EMPTY_PAGE_TEMPLATE)
 
-        # Check for required structural elements
-        assert "<header" in rendered
-        assert "<main" in rendered
-        assert "<footer" in rendered
 
-        # Check for toast container
-        assert 'id="toast-container"' in rendered
-
-        # Check for custom app.js
-        assert "js/app.js" in rendered
-
-
-def test_base_template_is_light_mode(app):
-    """Test that base template does not have dark mode class."""
-    with app.test_request_context():
-        from flask import render_template_string
-
-        template = """
-        {% extends "base.html" %}
-        {% block content %}{% endblock %}
-        """
-        rendered = render_template_string(template)
+def test_base_template_renders_with_title():
+    """Test that base template renders with custom title."""
+    template = """
+    {% extends "base.html" %}
+    {% block title %}Test Title{% endblock %}
+    {% block content %}Test Content{% endblock %}
+    """
+    rendered = render_template_string(template)
 
-        assert 'class="dark"' not in rendered
+    assert "Test Title" in rendered
+    assert "Test Content" in rendered
 
 
-def test_base_template_has_flexbox_layout(app):
-    """Test that base template uses flexbox layout for footer positioning."""
-    with app.test_request_context():
-        from flask import render_template_string
+@pytest.mark.parametrize("needle", BASE_REQUIRED_SNIPPETS)
+def test_base_template_has_required_elements(base_rendered, needle):
+    """Test that base template contains required HTML elements."""
+    assert needle in base_rendered
 
-        template = """
-        {% extends "base.html" %}
-        {% block content %}{% endblock %}
-        """
-        rendered = render_template_string(template)
 
-        # Check for flexbox classes
-        assert "flex flex-col" in rendered
-        assert "flex-grow" in rendered
+@pytest.mark.parametrize("needle", BASE_FORBIDDEN_SNIPPETS)
+def test_base_template_excludes_forbidden_markup(base_rendered, needle):
+    """Test that base template uses no CDN assets and stays in light mode."""
+    assert needle not in base_rendered
 
 
-def test_base_template_footer_year_is_dynamic(app):
+def test_base_template_footer_year_is_dynamic(base_rendered):
     """Test that footer year is dynamically generated."""
-    with app.test_request_context():
-        from flask import render_template_string
-
-        template = """
-        {% extends "base.html" %}
-        {% block content %}{% endblock %}
-        """
-        rendered = render_template_string(template)
-
-        current_year = str(datetime.now().year)
-        assert f"&copy; {current_year}" in rendered
-
-
-def test_base_template_menu_judge_branding(app):
-    """Test that Menu Judge branding is present."""
-    with app.test_request_context():
-        from flask import render_template_string
-
-        template = """
-        {% extends "base.html" %}
-        {% block content %}{% endblock %}
-        """
-        rendered = render_template_string(template)
-
-        assert "Menu Judge" in rendered
+    assert f"&copy; {CURRENT_YEAR}" in base_rendered
 
 
-def test_base_template_blocks_are_extendable(app):
+def test_base_template_blocks_are_extendable():
     """Test that all template blocks can be extended."""
-    with app.test_request_context():
-        from flask import render_template_string
-
-        template = """
-        {% extends "base.html" %}
-        {% block title %}Custom Title{% endblock %}
-        {% block head %}<meta name="custom" content="test">{% endblock %}
-        {% block content %}<div id="test-content">Test</div>{% endblock %}
-        {% block scripts %}<script>console.log('test');</script>{% endblock %}
-        """
-        rendered = render_template_string(template)
-
-        assert "Custom Title" in rendered
-        assert '<meta name="custom" content="test">' in rendered
-        assert '<div id="test-content">Test</div>' in rendered
-        assert "console.log('test')" in rendered
-
-
-def test_loading_component_renders(app):
+    template = """
+    {% extends "base.html" %}
+    {% block title %}Custom Title{% endblock %}
+    {% block head %}<meta name="custom" content="test">{% endblock %}
+    {% block content %}<div id="test-content">Test</div>{% endblock %}
+    {% block scripts %}<script>console.log('test');</script>{% endblock %}
+    """
+    rendered = render_template_string(template)
+
+    assert "Custom Title" in rendered
+    assert '<meta name="custom" content="test">' in rendered
+    assert '<div id="test-content">Test</div>' in rendered
+    assert "console.log('test')" in rendered
+
+
+def test_loading_component_renders():
     """Test that loading component renders correctly."""
-    with app.test_request_context():
-        from flask import render_template
+    from flask import render_template
 
-        rendered = render_template("components/loading.html")
+    rendered = render_template("components/loading.html")
 
-        # Check for spinner container
-        assert "loading-container" in rendered
+    # Check for spinner container
+    assert "loading-container" in rendered
 
-        # Check for spinner SVG
-        assert "animate-spin" in rendered
-        assert "<svg" in rendered
-        assert "<circle" in rendered
-        assert "<path" in rendered
+    # Check for spinner SVG
+    assert "animate-spin" in rendered
+    assert "<svg" in rendered
+    assert "<circle" in rendered
+    assert "<path" in rendered
 
-        # Loading messages are rendered client-side via Alpine.js (t() calls in x-text)
-        assert "loading.step1_title" in rendered
-        assert "x-text" in rendered
+    # Loading messages are rendered client-side via Alpine.js (t() calls in x-text)
+    assert "loading.step1_title" in rendered
+    assert "x-text" in rendered
 
-        # Check for indeterminate progress bar
-        assert "animate-indeterminate" in rendered
+    # Check for indeterminate progress bar
+    assert "animate-indeterminate" in rendered
 
 
-def test_loading_component_has_required_animations(app):
+def test_loading_component_has_required_animations():
     """Test that loading component has all required animations."""
-    with app.test_request_context():
-        from flask import render_template
+    from flask import render_template
 
-        rendered = render_template("components/loading.html")
+    rendered = render_template("components/loading.html")
 
-        # Check for Tailwind animations
-        assert "animate-spin" in rendered
+    # Check for Tailwind animations
+    assert "animate-spin" in rendered
 
-        # Check for custom indeterminate animation
-        assert "animate-indeterminate" in rendered
+    # Check for custom indeterminate animation
+    assert "animate-indeterminate" in rendered
 
 
-def test_loading_component_has_accessibility(app):
+def test_loading_component_has_accessibility():
     """Test that loading component has proper text for screen readers."""
-    with app.test_request_context():
-        from flask import render_template
+    from flask import render_template
 
-        rendered = render_template("components/loading.html")
+    rendered = render_template("components/loading.html")
 
-        # Check for user-friendly messages
-        assert "メニューを解析中" in rendered or "Loading" in rendered
+    # Check for user-friendly messages
+    assert "メニューを解析中" in rendered or "Loading" in rendered